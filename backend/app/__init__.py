@@ -1,7 +1,15 @@
 import os
+
+import click
 from flask import Flask
-from .config import DevConfig, ProdConfig
-from .extensions import db, cors, migrate
+from .config import DevConfig, ProdConfig, MIGRATIONS_DIR
+from .compression import init_compression
+from .extensions import db, cors, init_migrate
+from .jobs import init_jobs
+from .json_provider import init_json
+from .metrics import init_metrics
+from .pagination import CURSOR_HEADER
+from .sqlite import configure_sqlite
 from .routes import ALL_BLUEPRINTS
 
 
@@ -15,15 +23,26 @@ def _select_config():
     }.get(cfg_name, DevConfig)
 
 
-def create_app(config_class=None):
+def create_app(config_class=None, cli=True):
+    """
+    Build the app.  ``cli=False`` (wsgi.py) leaves out what only the ``flask``
+    command needs — Flask-Migrate and its alembic import, a large share of a
+    worker's start-up on the Pi.
+    """
     app = Flask(__name__, instance_relative_config=True)
 
     # choose config automatically unless caller overrides
     app.config.from_object(config_class or _select_config())
 
-    cors.init_app(app)
+    init_json(app)
+    cors.init_app(app, expose_headers=[CURSOR_HEADER])
     db.init_app(app)
-    migrate.init_app(app, db)
+    if cli:
+        init_migrate(app, directory=str(MIGRATIONS_DIR), render_as_batch=True)
+    configure_sqlite(app)
+    init_metrics(app)
+    init_compression(app)
+    init_jobs(app)
 
     for bp in ALL_BLUEPRINTS:
         app.register_blueprint(bp)
@@ -31,7 +50,62 @@ def create_app(config_class=None):
     # quick CLI helper
     @app.cli.command("create-db")
     def _create_db():
+        from flask_migrate import stamp
         db.create_all()
+        stamp()         # already the newest schema: `flask db upgrade` starts from here
         print("Database tables created")
 
+    @app.cli.command("rebuild-summary")
+    def _rebuild_summary():
+        from .summary import rebuild
+        from .versions import bump
+        rebuild()
+        bump("sales")
+        db.session.commit()
+        print("daily_sales summary rebuilt")
+
+    @app.cli.command("rebuild-stock")
+    def _rebuild_stock():
+        from .stock import rebuild
+        from .versions import bump
+        rebuild()
+        bump("inventory")
+        db.session.commit()
+        print("stock_level rebuilt")
+
+    @app.cli.command("rebuild-search")
+    def _rebuild_search():
+        from .search import rebuild
+        rebuild()
+        db.session.commit()
+        print("product_search index rebuilt")
+
+    @app.cli.command("run-jobs")
+    @click.option("--threads", default=1, show_default=True, help="jobs run at once")
+    def _run_jobs(threads):
+        """Run queued background jobs in this process until interrupted."""
+        from .jobs import start_runners
+        print(f"running jobs with {threads} thread(s), Ctrl-C to stop")
+        for t in start_runners(app, threads):
+            t.join()
+
+    @app.cli.command("export-columnar")
+    @click.argument("dataset")
+    @click.option("--start", required=True, help="YYYY-MM-DD")
+    @click.option("--end", required=True, help="YYYY-MM-DD")
+    @click.option("--format", "fmt", default="parquet", type=click.Choice(["parquet", "arrow"]))
+    @click.option("--out", "out_path", default=None, help="defaults to <dataset>_<start>_<end>.<ext>")
+    def _export_columnar(dataset, start, end, fmt, out_path):
+        """Dump batches|entries|payments|inventory to Parquet / Arrow IPC."""
+        from .columnar import FORMATS, write_dataset
+        from .exporter import date_range_args
+        try:
+            start_d, end_d = date_range_args({"start": start, "end": end})
+        except ValueError as exc:
+            raise click.BadParameter(str(exc))
+        out_path = out_path or f"{dataset}_{start}_{end}{FORMATS[fmt]}"
+        rows = write_dataset(dataset, start_d, end_d, out_path, fmt,
+                             rows_per_batch=app.config["COLUMNAR_ROW_GROUP"])
+        print(f"{rows} rows written to {out_path}")
+
     return app
@@ -0,0 +1,65 @@
+"""
+In-process product catalog cache.
+
+Each worker keeps ``{id: ProductInfo(id, name, price, attr_num)}`` in
+memory and reloads it (one SELECT of the whole catalog) only when the
+``products`` version stamp in the database has moved — see versions.py.
+The stamp is checked at most once per request (piggybacking on the
+request's version read), so every gunicorn worker picks up another worker's
+product writes on its next request:
+
+   from app import catalog
+   prod = catalog.get(product_id)        # ProductInfo or None
+   name = prod.name if prod else None
+"""
+import threading
+from typing import NamedTuple
+
+from flask import g
+from sqlalchemy import select
+
+from .extensions import db
+from .models import Product
+from .versions import current
+
+
+class ProductInfo(NamedTuple):
+    id: int
+    name: str
+    price: int              # cents
+    attr_num: str | None
+
+
+_lock = threading.Lock()
+_version = None
+_products: dict[int, ProductInfo] = {}
+
+
+def products() -> dict[int, ProductInfo]:
+    """The whole catalog, reloaded first if another write bumped its version."""
+    global _version, _products
+    if g.get("catalog_checked"):
+        return _products
+
+    version, _ = current("products")        # shares the request's version read
+    with _lock:
+        if version != _version:
+            rows = db.session.execute(
+                select(Product.id, Product.name, Product.price, Product.attr_num)
+            )
+            _products = {r.id: ProductInfo(*r) for r in rows}
+            _version = version
+    g.catalog_checked = True
+    return _products
+
+
+def get(product_id) -> ProductInfo | None:
+    return products().get(product_id)
+
+
+def invalidate():
+    """Drop this worker's copy; call after committing a product write."""
+    global _version
+    with _lock:
+        _version = None
+    g.pop("catalog_checked", None)
@@ -0,0 +1,118 @@
+"""
+gzip / brotli compression of ``/api/*`` responses.
+
+``init_compression(app)`` adds an after_request hook that picks an encoding
+from ``Accept-Encoding`` (brotli when the ``brotli`` package is installed
+and the client accepts it, else gzip) and compresses:
+
+- buffered JSON/CSV/text bodies of at least ``COMPRESS_MIN_BYTES``;
+- streamed bodies (CSV exports, ``?stream=1`` JSON arrays) chunk by chunk,
+  since their size isn't known up front and they are large by design.
+
+Compressed responses carry ``Vary: Accept-Encoding`` and a weak ETag, which
+the conditional GETs in versions.py still match.  Brotli runs at
+``COMPRESS_BR_QUALITY`` (default 4) — the high qualities cost far more CPU
+than a Pi should spend per request.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:             # optional; gzip only
+    brotli = None
+
+COMPRESSIBLE = {"application/json", "text/csv", "text/plain", "text/html"}
+
+
+def _negotiate(accept):
+    if brotli is not None and accept.quality("br") > 0:
+        return "br"
+    if accept.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def _compressor(coding, cfg):
+    """(compress(chunk) -> bytes, flush() -> bytes) for *coding*."""
+    if coding == "br":
+        c = brotli.Compressor(quality=cfg["COMPRESS_BR_QUALITY"])
+        return c.process, c.finish
+    c = zlib.compressobj(cfg["COMPRESS_LEVEL"], zlib.DEFLATED, 31)   # 31 → gzip framing
+    return c.compress, c.flush
+
+
+def _compress_body(body, coding, cfg):
+    if coding == "br":
+        return brotli.compress(body, quality=cfg["COMPRESS_BR_QUALITY"])
+    return gzip.compress(body, compresslevel=cfg["COMPRESS_LEVEL"], mtime=0)
+
+
+def _compress_stream(chunks, coding, cfg, charset="utf-8"):
+    compress, flush = _compressor(coding, cfg)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            out = compress(chunk)
+            if out:
+                yield out
+        yield flush()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+
+
+def _not_modified(response):
+    """A 304 repeats the tag the client revalidated with (weak if it was compressed)."""
+    etag, weak = response.get_etag()
+    inm = request.if_none_match
+    if etag and not weak and inm and not inm.contains(etag):
+        response.set_etag(etag, weak=True)
+    if request.path.startswith("/api/"):
+        response.vary.add("Accept-Encoding")
+    return response
+
+
+def init_compression(app):
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+    cfg = app.config
+
+    @app.after_request
+    def _compress(response):
+        if response.status_code == 304:
+            return _not_modified(response)
+        if (
+            not request.path.startswith("/api/")
+            or request.method == "HEAD"
+            or response.status_code in (204, 206)
+            or response.status_code < 200
+            or response.direct_passthrough              # send_file
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        coding = _negotiate(request.accept_encodings)
+        if coding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, coding, cfg)
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < cfg["COMPRESS_MIN_BYTES"]:
+                return response
+            response.set_data(_compress_body(body, coding, cfg))
+
+        response.headers["Content-Encoding"] = coding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)    # the bytes now depend on the encoding
+        return response
@@ -0,0 +1,140 @@
+"""
+Streaming CSV exports.
+
+Each export is a single Core SELECT read through a server-side cursor
+(``yield_per``) and written into a CSV buffer that is flushed to the client
+every ``EXPORT_CHUNK_BYTES``, so memory stays flat and the response is made
+of a few large chunks rather than one per row:
+
+   columns, stmt = dataset("entries", start_d, end_d)
+   return csv_response("entries.csv", columns, stmt, row_fn)
+
+The dataset SELECTs are shared with the columnar (Parquet/Arrow) dumps.
+Money columns are stored in cents and exported in dollars, converted by
+SQLite as the rows are read.
+"""
+import csv
+import io
+from datetime import datetime
+
+from flask import Response, current_app, stream_with_context
+from sqlalchemy import select
+
+from .extensions import db
+from .models import Batch, Entry, Inventory, InventoryEntry, Payment, Product
+
+DATE_FMT = "%Y-%m-%d"
+
+
+# ---------- datasets ----------
+def _dollars(column):
+    return (column / 100.0).label(column.key)
+
+
+def _batches(start_d, end_d):
+    return (
+        select(Batch.date, Batch.id, _dollars(Batch.card_amount), _dollars(Batch.cash_amount),
+               _dollars(Batch.total_amount))
+        .where(Batch.date >= start_d, Batch.date <= end_d)
+        .order_by(Batch.date, Batch.id)
+    )
+
+
+def _entries(start_d, end_d):
+    return (
+        select(Batch.date, Entry.batch_id, Entry.id, Entry.product_id, Product.name,
+               Entry.qty, _dollars(Entry.price), _dollars(Entry.discount), Entry.size)
+        .join(Batch, Batch.id == Entry.batch_id)
+        .outerjoin(Product, Product.id == Entry.product_id)
+        .where(Batch.date >= start_d, Batch.date <= end_d)
+        .order_by(Batch.date, Entry.id)
+    )
+
+
+def _payments(start_d, end_d):
+    return (
+        select(Batch.date, Entry.batch_id, Payment.entry_id, Payment.id,
+               Payment.payment_type, _dollars(Payment.amount))
+        .join(Entry, Entry.id == Payment.entry_id)
+        .join(Batch, Batch.id == Entry.batch_id)
+        .where(Batch.date >= start_d, Batch.date <= end_d)
+        .order_by(Batch.date, Payment.entry_id, Payment.id)
+    )
+
+
+def _inventory(start_d, end_d):
+    return (
+        select(Inventory.date, Inventory.id, InventoryEntry.id, InventoryEntry.product_id,
+               Product.attr_num, Product.name, _dollars(Product.price), InventoryEntry.qty)
+        .join(InventoryEntry, InventoryEntry.inventory_id == Inventory.id)
+        .outerjoin(Product, Product.id == InventoryEntry.product_id)
+        .where(Inventory.date >= start_d, Inventory.date <= end_d)
+        .order_by(Inventory.date, Inventory.id, InventoryEntry.id)
+    )
+
+
+# name → (output column names, SELECT builder(start_d, end_d))
+DATASETS = {
+    "batches":   (("date", "batch_id", "card_amount", "cash_amount", "total_amount"),
+                  _batches),
+    "entries":   (("date", "batch_id", "entry_id", "product_id", "product_name",
+                   "qty", "price", "discount", "size"),
+                  _entries),
+    "payments":  (("date", "batch_id", "entry_id", "payment_id", "payment_type", "amount"),
+                  _payments),
+    "inventory": (("date", "inventory_id", "item_id", "product_id", "attr_num",
+                   "name", "price", "qty"),
+                  _inventory),
+}
+
+
+def dataset(name, start_d, end_d):
+    """(column names, SELECT) for export dataset *name* over [start_d, end_d]."""
+    columns, build = DATASETS[name]
+    return columns, build(start_d, end_d)
+
+
+def date_range_args(args):
+    """(start, end) dates from ?start=&end=; raises ValueError with a client message."""
+    start, end = args.get("start"), args.get("end")
+    if not (start and end):
+        raise ValueError("start and end query params required")
+    try:
+        return (datetime.strptime(start, DATE_FMT).date(),
+                datetime.strptime(end, DATE_FMT).date())
+    except ValueError:
+        raise ValueError("Invalid date format, use YYYY-MM-DD")
+
+
+def stream_rows(stmt, yield_per):
+    """Execute *stmt* with a server-side cursor, yielding rows batch by batch."""
+    result = db.session.execute(stmt.execution_options(yield_per=yield_per))
+    for partition in result.partitions():
+        yield from partition
+
+
+def csv_chunks(header, rows, chunk_bytes):
+    """Encode *rows* as CSV text, yielded in pieces of roughly *chunk_bytes*."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= chunk_bytes:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def csv_response(filename, header, stmt, row_fn=tuple):
+    """Stream the result of *stmt* as a CSV attachment; *row_fn* maps each row."""
+    cfg = current_app.config
+    rows = (row_fn(r) for r in stream_rows(stmt, cfg["EXPORT_YIELD_PER"]))
+    body = stream_with_context(csv_chunks(header, rows, cfg["EXPORT_CHUNK_BYTES"]))
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Content-Type": "text/csv",
+    }
+    return Response(body, headers=headers)
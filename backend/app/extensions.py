@@ -1,7 +1,21 @@
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 
 db = SQLAlchemy()
-migrate = Migrate()
 cors = CORS()
+
+
+def init_migrate(app, **kwargs):
+    """Flask-Migrate (``flask db``).  It imports alembic, so web workers skip it."""
+    from flask_migrate import Migrate
+    Migrate(app, db, **kwargs)
+
+
+def dispose_engines(app):
+    """
+    Forget the pooled connections inherited from a parent process (gunicorn
+    preload_app): the child opens its own, the parent's stay the parent's.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,182 @@
+"""
+Streaming CSV inventory import.
+
+The upload is decoded and parsed row by row; each date's items are buffered
+only up to ``chunk_size`` rows before being written, so memory stays flat no
+matter how large the file is:
+
+   result = import_csv_stream(file_storage.stream, chunk_size=5000)
+   db.session.commit() if not result["error_count"] else db.session.rollback()
+
+An inventory that already exists on a date is updated in place: items are
+diffed by product_id, so re-importing an unchanged count writes nothing.
+
+Columns: date, product_id, qty (same as /api/inventory/import-template).
+Nothing is committed here; the caller decides based on ``error_count``.
+"""
+import csv
+import io
+from datetime import datetime
+
+from . import catalog, stock
+from .inventory_sync import Changes, inventories_for_dates, load_items, merge, recompute_totals
+
+DATE_FMT = "%Y-%m-%d"
+MAX_REPORTED_ERRORS = 50
+
+
+def import_csv_stream(raw, chunk_size=5000, on_progress=None):
+    """
+    Import inventory rows from the binary stream *raw*.
+
+    *on_progress(rows_read)* is called every *chunk_size* rows and once at
+    the end.  Returns a dict with ``imported_dates``, ``rows``, ``errors``
+    (first MAX_REPORTED_ERRORS, each with its CSV line number),
+    ``error_count`` and ``items`` (inserted / updated / deleted counts).
+    """
+    job = _StreamImport(chunk_size, on_progress)
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    try:
+        job.run(csv.DictReader(text))
+    finally:
+        text.detach()           # leave the upload stream open for its owner
+    return job.result()
+
+
+class _StreamImport:
+    def __init__(self, chunk_size, on_progress):
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.products = catalog.products()
+        self.inv_ids = {}       # date → inventory id written by this import
+        self.changes = {"inserted": 0, "updated": 0, "deleted": 0}
+        self._state = None      # (date, inv id, stored {pid: [item id, qty]}, seen pids)
+        self._unlisted = {}     # inv id → {item id: pid} stored but not (yet) in the file
+        self.rows = 0
+        self.errors = []
+        self.error_count = 0
+        self._date = None
+        self._buf = []          # [(line_no, product_id, qty)] for self._date
+
+    # ---------- reading ----------
+    def run(self, reader):
+        for row in reader:
+            line_no = reader.line_num
+            try:
+                inv_date = datetime.strptime(row["date"], DATE_FMT).date()
+                pid, qty = int(row["product_id"]), int(row["qty"])
+            except (KeyError, ValueError, TypeError):
+                self._error(line_no, "expected date (YYYY-MM-DD), product_id and qty")
+                continue
+
+            if inv_date != self._date or len(self._buf) >= self.chunk_size:
+                self._flush()
+                self._date = inv_date
+            self._buf.append((line_no, pid, qty))
+
+            self.rows += 1
+            if self.on_progress and self.rows % self.chunk_size == 0:
+                self.on_progress(self.rows)
+
+        self._flush()
+        self._finish()
+        if self.on_progress:
+            self.on_progress(self.rows)
+
+    def result(self):
+        return {
+            "imported_dates": sorted(d.strftime(DATE_FMT) for d in self.inv_ids),
+            "rows": self.rows,
+            "errors": sorted(self.errors, key=lambda e: e["line"]),
+            "error_count": self.error_count,
+            "items": self.changes,
+        }
+
+    def _error(self, line_no, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "error": message})
+
+    # ---------- writing ----------
+    # Items are diffed against what the date's inventory already holds
+    # (inventory_sync): only new, changed or dropped products are written.
+    # The stored items of the date being written are kept in memory.  A date
+    # may come back later in the file, so products it didn't list are only
+    # deleted, and totals recomputed, once the whole file has been read.
+
+    def _flush(self):
+        """Write the buffered rows for self._date."""
+        if not self._buf:
+            return
+        buf, self._buf = self._buf, []
+
+        items = []
+        for line_no, pid, qty in buf:
+            if pid in self.products:
+                items.append((pid, qty))
+            else:
+                self._error(line_no, f"Unknown product {pid}")
+        if self.error_count:
+            return              # import will be rolled back; keep scanning only
+
+        inv_id, stored, seen = self._open(self._date)
+        changes, added = Changes(), {}
+        for pid, qty in merge(items).items():
+            if pid in seen:
+                qty += stored[pid][1]       # repeated product: quantities add up
+            seen.add(pid)
+            if pid not in stored:
+                added[pid] = qty
+                changes.inserts.append({"inventory_id": inv_id, "product_id": pid, "qty": qty})
+            elif stored[pid][1] != qty:
+                stored[pid][1] = qty
+                changes.updates.append({"id": stored[pid][0], "qty": qty})
+        self._count(changes.apply(returning=True))
+        for item_id, _, pid in changes.inserted:
+            stored[pid] = [item_id, added[pid]]
+
+    def _open(self, inv_date):
+        """(inventory id, stored items, products seen) for *inv_date*."""
+        if self._state and self._state[0] == inv_date:
+            return self._state[1:]
+        self._close()
+
+        revisit = inv_date in self.inv_ids
+        if not revisit:
+            self.inv_ids[inv_date] = inventories_for_dates([inv_date])[inv_date]
+        inv_id = self.inv_ids[inv_date]
+
+        changes = Changes()
+        stored = load_items([inv_id], changes)[inv_id]
+        self._count(changes.apply())            # duplicate stored rows, if any
+        if revisit:
+            unlisted = self._unlisted.pop(inv_id, {})
+            seen = set(stored) - set(unlisted.values())
+        else:
+            seen = set()
+        self._state = (inv_date, inv_id, stored, seen)
+        return self._state[1:]
+
+    def _close(self):
+        """Leave the open date, remembering which stored products it hasn't listed."""
+        if not self._state:
+            return
+        _, inv_id, stored, seen = self._state
+        self._state = None
+        self._unlisted[inv_id] = {item_id: pid for pid, (item_id, _) in stored.items()
+                                  if pid not in seen}
+
+    def _finish(self):
+        """End of file: drop the products no row listed, then fix every total."""
+        self._close()
+        if self.error_count:
+            return
+        changes = Changes()
+        changes.deletes = [item_id for unlisted in self._unlisted.values() for item_id in unlisted]
+        self._count(changes.apply())
+        recompute_totals(list(self.inv_ids.values()))
+        stock.inventories_changed(list(self.inv_ids))
+
+    def _count(self, stats):
+        for k, v in stats.items():
+            self.changes[k] += v
@@ -0,0 +1,179 @@
+"""
+Diff-based writes of inventory items.
+
+Instead of deleting an inventory's items and inserting the new list, the
+incoming items are compared with the stored rows by ``product_id`` and only
+the differences are written — editing one line of a 500-item count updates
+one row.  Duplicate product_ids in the input are summed; duplicate stored
+rows are collapsed into the oldest one.  ``qty_amount`` / ``total_amount``
+are then recomputed in SQL from the rows actually stored:
+
+   inv_ids = inventories_for_dates([d])
+   stats = sync_items({inv_ids[d]: [(product_id, qty), …]})
+   # → {"inserted": 0, "updated": 1, "deleted": 0}
+
+Nothing is committed here.
+"""
+from collections import defaultdict
+
+from sqlalchemy import delete, func, insert, select, update
+
+from .extensions import db
+from .models import Inventory, InventoryEntry, Product
+from .queries import IN_CHUNK
+
+
+def _chunks(values):
+    values = list(values)
+    for i in range(0, len(values), IN_CHUNK):
+        yield values[i:i + IN_CHUNK]
+
+
+def merge(items) -> dict:
+    """[(product_id, qty), …] → {product_id: summed qty}"""
+    out = defaultdict(int)
+    for pid, qty in items:
+        out[pid] += qty
+    return out
+
+
+class Changes:
+    """Item inserts / updates / deletes collected across inventories."""
+
+    def __init__(self):
+        self.inserts = []       # {"inventory_id", "product_id", "qty"}
+        self.updates = []       # {"id", "qty"}
+        self.deletes = []       # item ids
+        self.inserted = []      # RETURNING rows of the last apply(returning=True)
+
+    def diff(self, inv_id, stored, wanted):
+        """
+        Queue what turns *stored* ({product_id: [item_id, qty]}) into *wanted*
+        ({product_id: qty}) for inventory *inv_id*.
+        """
+        for pid, (item_id, qty) in stored.items():
+            if pid not in wanted:
+                self.deletes.append(item_id)
+            elif wanted[pid] != qty:
+                self.updates.append({"id": item_id, "qty": wanted[pid]})
+        for pid, qty in wanted.items():
+            if pid not in stored:
+                self.inserts.append({"inventory_id": inv_id, "product_id": pid, "qty": qty})
+
+    def apply(self, returning=False):
+        """
+        Execute the queued changes (one statement per kind and IN chunk) and
+        return their counts.  With *returning*, the inserted
+        (id, inventory_id, product_id) rows are left in ``self.inserted``.
+        """
+        for chunk in _chunks(self.deletes):
+            db.session.execute(delete(InventoryEntry).where(InventoryEntry.id.in_(chunk)))
+        if self.updates:
+            db.session.execute(update(InventoryEntry), self.updates)     # executemany by PK
+
+        self.inserted = []
+        if self.inserts:
+            stmt = insert(InventoryEntry)
+            if returning:
+                stmt = stmt.returning(InventoryEntry.id, InventoryEntry.inventory_id,
+                                      InventoryEntry.product_id)
+                self.inserted = db.session.execute(stmt, self.inserts).all()
+            else:
+                db.session.execute(stmt, self.inserts)
+
+        stats = self.stats()
+        self.inserts, self.updates, self.deletes = [], [], []
+        return stats
+
+    def stats(self):
+        return {"inserted": len(self.inserts), "updated": len(self.updates),
+                "deleted": len(self.deletes)}
+
+
+def load_items(inv_ids, changes):
+    """
+    {inv_id: {product_id: [item_id, qty]}} for the stored items; extra rows
+    for a product already seen are queued on *changes* for deletion.
+    """
+    out = {inv_id: {} for inv_id in inv_ids}
+    for chunk in _chunks(inv_ids):
+        rows = db.session.execute(
+            select(InventoryEntry.inventory_id, InventoryEntry.product_id,
+                   InventoryEntry.id, InventoryEntry.qty)
+            .where(InventoryEntry.inventory_id.in_(chunk))
+            .order_by(InventoryEntry.id)
+        )
+        for inv_id, pid, item_id, qty in rows:
+            stored = out[inv_id]
+            if pid in stored:
+                changes.deletes.append(item_id)
+            else:
+                stored[pid] = [item_id, qty]
+    return out
+
+
+def recompute_totals(inv_ids):
+    """Set qty_amount / total_amount of *inv_ids* from their stored items."""
+    qty = (
+        select(func.coalesce(func.sum(InventoryEntry.qty), 0))
+        .where(InventoryEntry.inventory_id == Inventory.id)
+        .scalar_subquery()
+    )
+    total = (
+        select(func.coalesce(func.sum(InventoryEntry.qty * Product.price), 0))
+        .join(Product, Product.id == InventoryEntry.product_id)
+        .where(InventoryEntry.inventory_id == Inventory.id)
+        .scalar_subquery()
+    )
+    for chunk in _chunks(inv_ids):
+        db.session.execute(
+            update(Inventory)
+            .where(Inventory.id.in_(chunk))
+            .values(qty_amount=qty, total_amount=total)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def inventories_for_dates(dates) -> dict:
+    """
+    {date: inventory id} with exactly one inventory per date: the oldest
+    existing one is kept (any others on that date are deleted), and dates
+    without one get a new, empty inventory.
+    """
+    inv_ids, extra = {}, []
+    for chunk in _chunks(dates):
+        rows = db.session.execute(
+            select(Inventory.id, Inventory.date)
+            .where(Inventory.date.in_(chunk))
+            .order_by(Inventory.id)
+        )
+        for inv_id, inv_date in rows:
+            if inv_date in inv_ids:
+                extra.append(inv_id)
+            else:
+                inv_ids[inv_date] = inv_id
+
+    for chunk in _chunks(extra):
+        db.session.execute(delete(InventoryEntry).where(InventoryEntry.inventory_id.in_(chunk)))
+        db.session.execute(delete(Inventory).where(Inventory.id.in_(chunk)))
+
+    # dates are unique here, so RETURNING rows can be matched back by date
+    missing = [{"date": d, "qty_amount": 0, "total_amount": 0}
+               for d in dict.fromkeys(dates) if d not in inv_ids]
+    if missing:
+        returned = db.session.execute(
+            insert(Inventory).returning(Inventory.id, Inventory.date), missing
+        )
+        inv_ids.update((inv_date, inv_id) for inv_id, inv_date in returned)
+    return inv_ids
+
+
+def sync_items(items_by_inv) -> dict:
+    """Make each inventory's items equal *items_by_inv[inv_id]*; returns change counts."""
+    changes = Changes()
+    stored = load_items(list(items_by_inv), changes)
+    for inv_id, items in items_by_inv.items():
+        changes.diff(inv_id, stored[inv_id], merge(items))
+    stats = changes.apply()
+    recompute_totals(list(items_by_inv))
+    return stats
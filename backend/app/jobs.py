@@ -0,0 +1,375 @@
+"""
+Background jobs for work that can outlast gunicorn's worker timeout:
+CSV inventory imports, columnar exports and summary rebuilds.
+
+The request only queues the job and answers 202 with its id.  A runner
+thread (in each app process, or in a dedicated ``flask run-jobs``) claims
+it, runs it in an app context and records progress and the outcome for
+clients polling ``GET /api/jobs/<id>``:
+
+   job_id = jobs.submit("export", {"dataset": "entries", "start": "2024-01-01",
+                                   "end": "2024-12-31", "format": "parquet"})
+   jobs.get(job_id).status      # "queued" → "running" → "done" | "failed"
+
+There is no broker.  The queue is the ``job`` table in its own SQLite file
+(the ``jobs`` bind), and claiming is a single UPDATE of the oldest queued
+row, so each job runs once however many processes poll.  Jobs that write
+the sales database run one at a time.  A job whose process died (worker
+restart, deploy) is marked failed by the next sweep.
+"""
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from flask import current_app, jsonify
+from sqlalchemy import delete, exists, func, insert, or_, select, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from . import serializers, summary
+from .columnar import FORMATS, write_dataset
+from .exporter import date_range_args
+from .extensions import db
+from .importer import import_csv_stream
+from .models import DailySales, Job
+from .versions import bump
+
+log = logging.getLogger("app.jobs")
+
+FINISHED = ("done", "failed")
+JOB_COLUMNS = (Job.id, Job.kind, Job.status, Job.params, Job.progress, Job.result,
+               Job.error, Job.file, Job.created_at, Job.started_at, Job.finished_at)
+PROGRESS_EVERY = 1.0        # seconds between progress writes
+SWEEP_EVERY = 60.0          # seconds between dead-worker / retention sweeps
+
+TASKS = {}                  # kind → (fn(job), writes the sales DB)
+
+
+class JobError(Exception):
+    """Raised by a task to fail its job with a message (and an optional result)."""
+
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+
+def task(kind, writes=False):
+    """Register *fn(job)* as the runner of *kind* jobs; its return value is the result."""
+    def decorator(fn):
+        TASKS[kind] = (fn, writes)
+        return fn
+    return decorator
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+_prepared = weakref.WeakSet()       # jobs engines whose queue table is set up
+_prepare_lock = threading.Lock()
+
+
+def _engine():
+    """The ``jobs`` bind, its queue table created on first use rather than at start-up."""
+    engine = db.engines["jobs"]
+    if engine not in _prepared:
+        with _prepare_lock:
+            if engine not in _prepared:
+                _prepare(engine)
+                _prepared.add(engine)
+    return engine
+
+
+def _prepare(engine):
+    # IF NOT EXISTS: workers may race to do this for a fresh queue file
+    with engine.begin() as conn:
+        conn.execute(CreateTable(Job.__table__, if_not_exists=True))
+        for index in Job.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")     # pollers never block runners
+
+
+def job_dir() -> Path:
+    path = Path(current_app.config["JOBS_DIR"])
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+# ---------- queue ----------
+def submit(kind, params) -> int:
+    """Queue a *kind* job with JSON-able *params*; returns its id."""
+    if kind not in TASKS:
+        raise ValueError(f"unknown job kind {kind!r}")
+    with _engine().begin() as conn:
+        job_id = conn.execute(
+            insert(Job).values(kind=kind, status="queued", params=params, created_at=_now())
+            .returning(Job.id)
+        ).scalar_one()
+    start_runners(current_app._get_current_object())
+    _wake.set()
+    return job_id
+
+
+def accepted(job_id):
+    """202 response for a freshly queued job, pointing at its status URL."""
+    resp = jsonify(serializers.job(get(job_id)))
+    resp.status_code = 202
+    resp.headers["Location"] = f"/api/jobs/{job_id}"
+    return resp
+
+
+def get(job_id):
+    """The JOB_COLUMNS row of *job_id*, or None."""
+    with _engine().connect() as conn:
+        return conn.execute(select(*JOB_COLUMNS).where(Job.id == job_id)).first()
+
+
+def recent(status=None, limit=50):
+    """Newest jobs first, optionally only those with *status*."""
+    stmt = select(*JOB_COLUMNS).order_by(Job.id.desc()).limit(limit)
+    if status:
+        stmt = stmt.where(Job.status == status)
+    with _engine().connect() as conn:
+        return conn.execute(stmt).all()
+
+
+def remove(job_id) -> bool:
+    """Cancel a queued job or forget a finished one, with its files; False while it runs."""
+    with _engine().begin() as conn:
+        row = conn.execute(
+            delete(Job).where(Job.id == job_id, Job.status != "running")
+            .returning(Job.file, Job.params)
+        ).first()
+    if row is None:
+        return False
+    _unlink(row)
+    return True
+
+
+def _unlink(row):
+    """Delete the output file and any unconsumed upload of a (file, params) row."""
+    for name in (row.file, (row.params or {}).get("upload")):
+        if name:
+            (job_dir() / name).unlink(missing_ok=True)
+
+
+# ---------- running ----------
+class JobContext:
+    """What a task gets: its id and params, a progress reporter and an output path."""
+
+    def __init__(self, job_id, params):
+        self.id = job_id
+        self.params = params
+        self.rows = 0
+        self.output = None          # file name in JOBS_DIR, once output_path() was called
+        self._reported = 0.0
+
+    def progress(self, rows):
+        """Record *rows* processed; written to the queue at most every PROGRESS_EVERY s."""
+        self.rows = rows
+        now = time.monotonic()
+        if now - self._reported < PROGRESS_EVERY:
+            return
+        self._reported = now
+        with _engine().begin() as conn:
+            conn.execute(update(Job).where(Job.id == self.id).values(progress=rows))
+
+    def output_path(self, download_name) -> Path:
+        """Where to write the job's downloadable file (served as *download_name*)."""
+        self.output = f"{self.id}-{download_name}"
+        return job_dir() / self.output
+
+    def discard_output(self):
+        if self.output:
+            (job_dir() / self.output).unlink(missing_ok=True)
+            self.output = None
+
+
+def _claim():
+    """Mark the oldest runnable queued job as running here; (id, kind, params) or None."""
+    writers = [kind for kind, (_, writes) in TASKS.items() if writes]
+    queued, running = aliased(Job), aliased(Job)
+    writer_busy = exists().where(running.status == "running", running.kind.in_(writers))
+    oldest = (
+        select(queued.id)
+        .where(queued.status == "queued", or_(queued.kind.not_in(writers), ~writer_busy))
+        .order_by(queued.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    with _engine().begin() as conn:
+        return conn.execute(
+            update(Job).where(Job.id == oldest)
+            .values(status="running", worker=os.getpid(), started_at=_now())
+            .returning(Job.id, Job.kind, Job.params)
+        ).first()
+
+
+def _finish(job_id, status, **values):
+    with _engine().begin() as conn:
+        conn.execute(update(Job).where(Job.id == job_id)
+                     .values(status=status, finished_at=_now(), **values))
+
+
+def run_next() -> bool:
+    """Claim and run one queued job (inside an app context); False if none was runnable."""
+    claimed = _claim()
+    if claimed is None:
+        return False
+    job_id, kind, params = claimed
+    job = JobContext(job_id, params)
+    log.info("job %d (%s) started", job_id, kind)
+    try:
+        result = TASKS[kind][0](job)
+    except JobError as exc:
+        db.session.rollback()
+        job.discard_output()
+        _finish(job_id, "failed", progress=job.rows, error=str(exc), result=exc.result)
+    except Exception as exc:
+        db.session.rollback()
+        job.discard_output()
+        log.exception("job %d (%s) failed", job_id, kind)
+        _finish(job_id, "failed", progress=job.rows, error=f"{type(exc).__name__}: {exc}")
+    else:
+        _finish(job_id, "done", progress=job.rows, result=result, file=job.output)
+    log.info("job %d (%s) finished", job_id, kind)
+    return True
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def sweep():
+    """Fail jobs whose process is gone; purge finished jobs older than JOBS_KEEP_HOURS."""
+    with _engine().connect() as conn:
+        running = conn.execute(select(Job.id, Job.worker).where(Job.status == "running")).all()
+    dead = [job_id for job_id, pid in running if not pid or not _alive(pid)]
+    if dead:
+        with _engine().begin() as conn:
+            conn.execute(update(Job).where(Job.id.in_(dead), Job.status == "running")
+                         .values(status="failed", finished_at=_now(),
+                                 error="worker process exited before the job finished"))
+        log.warning("jobs %s lost their worker process", dead)
+
+    cutoff = _now() - timedelta(hours=current_app.config["JOBS_KEEP_HOURS"])
+    with _engine().begin() as conn:
+        old = conn.execute(
+            delete(Job).where(Job.status.in_(FINISHED), Job.finished_at < cutoff)
+            .returning(Job.file, Job.params)
+        ).all()
+    for row in old:
+        _unlink(row)
+
+
+# ---------- runner threads ----------
+_wake = threading.Event()
+_lock = threading.Lock()
+_runners_pid = None
+
+
+def start_runners(app, threads=None):
+    """
+    Start *threads* (default JOBS_THREADS) runner threads, once per process —
+    a forked gunicorn worker starts its own.  Returns the new threads.
+    """
+    global _runners_pid
+    threads = app.config["JOBS_THREADS"] if threads is None else threads
+    if threads <= 0 or _runners_pid == os.getpid():
+        return []
+    with _lock:
+        if _runners_pid == os.getpid():
+            return []
+        _runners_pid = os.getpid()
+        started = []
+        for n in range(threads):
+            t = threading.Thread(target=_run_forever, args=(app,), name=f"job-runner-{n}",
+                                 daemon=True)
+            t.start()
+            started.append(t)
+    return started
+
+
+def _run_forever(app):
+    poll = app.config["JOBS_POLL_SECONDS"]
+    swept = 0.0
+    while True:
+        ran = False
+        try:
+            with app.app_context():
+                if time.monotonic() - swept >= SWEEP_EVERY:
+                    swept = time.monotonic()
+                    sweep()
+                ran = run_next()
+        except Exception:
+            log.exception("job runner error")
+        if not ran:
+            _wake.wait(poll)
+            _wake.clear()
+
+
+def init_jobs(app):
+    """
+    Start runners with the first request.  Nothing touches the disk here: the
+    queue file and JOBS_DIR are set up when first used, so a preloaded
+    gunicorn master (or bench.startup) builds the app without file I/O.
+    """
+    if app.config["JOBS_THREADS"] > 0:
+        @app.before_request
+        def _start_runners():
+            start_runners(app)
+
+
+# ---------- tasks ----------
+@task("inventory_import", writes=True)
+def _inventory_import(job):
+    """params: upload (CSV file in JOBS_DIR), filename."""
+    path = job_dir() / job.params["upload"]
+    try:
+        with open(path, "rb") as raw:
+            result = import_csv_stream(
+                raw,
+                chunk_size=current_app.config["INVENTORY_IMPORT_CHUNK"],
+                on_progress=job.progress,
+            )
+    finally:
+        path.unlink(missing_ok=True)
+    if result["error_count"]:
+        raise JobError("Import rejected, nothing was saved", result)
+    bump("inventory")
+    db.session.commit()
+    return result
+
+
+@task("export")
+def _export(job):
+    """params: dataset, start, end, format (parquet | arrow)."""
+    p = job.params
+    start_d, end_d = date_range_args(p)
+    out = job.output_path(f"{p['dataset']}_{p['start']}_{p['end']}{FORMATS[p['format']]}")
+    try:
+        rows = write_dataset(p["dataset"], start_d, end_d, out, p["format"],
+                             rows_per_batch=current_app.config["COLUMNAR_ROW_GROUP"],
+                             on_progress=job.progress)
+    except ImportError:
+        raise JobError("pyarrow is not installed on the server")
+    return {"rows": rows}
+
+
+@task("rebuild_summary", writes=True)
+def _rebuild_summary(job):
+    summary.rebuild()
+    bump("sales")
+    db.session.commit()
+    return {"rows": db.session.scalar(select(func.count()).select_from(DailySales))}
@@ -0,0 +1,61 @@
+"""
+JSON provider: orjson when it is installed, Flask's stdlib provider otherwise.
+
+``init_json(app)`` installs it as ``app.json``, so ``jsonify`` and
+``request.get_json`` go through it everywhere.  ``JSON_PROVIDER`` picks
+``"auto"`` (default), ``"orjson"`` or ``"stdlib"``.  Output is compact and
+keeps insertion order unless ``JSON_SORT_KEYS`` is set; debug mode indents.
+"""
+import decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:             # optional speed-up
+    orjson = None
+
+
+def _default(obj):
+    """Types orjson doesn't handle natively (it already does dates, UUIDs, dataclasses)."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding and decoding."""
+
+    def _options(self):
+        opts = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            opts |= orjson.OPT_INDENT_2
+        return opts
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app):
+    choice = app.config.get("JSON_PROVIDER", "auto")
+    if choice == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER='orjson' but orjson is not installed")
+    if choice == "stdlib" or orjson is None:
+        app.json = DefaultJSONProvider(app)
+    else:
+        app.json = OrjsonProvider(app)
+    app.json.sort_keys = app.config.get("JSON_SORT_KEYS", False)
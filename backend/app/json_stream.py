@@ -0,0 +1,33 @@
+"""
+Streamed JSON arrays for large list responses (``?stream=1``).
+
+The rows are read through a server-side cursor in partitions.  Each
+partition is serialized and written out before the next is fetched, so a
+worker holds one partition in memory rather than the whole response:
+
+   def chunks():
+       for rows in partitions(entry_rows(), 500):
+           yield serializers.entries(rows, products, payments_by_entry(…))
+   return json_array(chunks())
+"""
+from flask import current_app, stream_with_context
+
+
+def json_array(chunks):
+    """Stream an iterable of item lists as a single JSON array."""
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield "["
+        first = True
+        for items in chunks:
+            if not items:
+                continue
+            body = dumps(items)[1:-1]          # drop this chunk's own [ ]
+            yield body if first else "," + body
+            first = False
+        yield "]"
+
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype=current_app.json.mimetype
+    )
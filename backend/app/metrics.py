@@ -0,0 +1,190 @@
+"""
+Request / SQL instrumentation, exposed at ``GET /metrics`` (Prometheus
+text format).
+
+``init_metrics(app)`` hooks the request cycle and the SQLAlchemy engine:
+
+   http_requests_total{endpoint,method,status}       counter
+   http_request_duration_seconds{endpoint,method}     histogram
+   db_queries_per_request{endpoint}                   histogram
+   db_queries_total{endpoint}                         counter
+   db_query_seconds_total{endpoint}                   counter
+   db_slow_queries_total{endpoint}                    counter
+
+Each response also carries a ``Server-Timing`` header (view time, SQL time
+and statement count) for the browser's network tab.
+
+Statements slower than ``SLOW_QUERY_MS`` are logged (logger ``app.sql``)
+with the route that issued them.  Queries outside a request (CLI, startup)
+are counted under endpoint="-".
+
+Numbers are kept per process: with ``gunicorn -w 4`` each scrape sees the
+worker that happened to answer it, which is enough to spot the slow
+blueprint; run one worker (or sum over scrapes) for exact totals.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db
+
+log = logging.getLogger("app.sql")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 500)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_requests = defaultdict(int)                                  # (endpoint, method, status)
+_latency = defaultdict(lambda: _Histogram(LATENCY_BUCKETS))   # (endpoint, method)
+_per_request = defaultdict(lambda: _Histogram(QUERY_BUCKETS)) # endpoint
+_queries = defaultdict(int)                                   # endpoint
+_query_seconds = defaultdict(float)                           # endpoint
+_slow = defaultdict(int)                                      # endpoint
+_slow_ms = float("inf")                                       # set by init_metrics
+
+
+def _endpoint():
+    return (request.endpoint or "unmatched") if has_request_context() else "-"
+
+
+# ---------- hooks ----------
+def _before_request():
+    g.metrics_t0 = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+
+
+def _after_request(response):
+    t0 = g.pop("metrics_t0", None)
+    if t0 is None:
+        return response
+    elapsed = time.perf_counter() - t0
+    endpoint = _endpoint()
+    response.headers["Server-Timing"] = (
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={g.get("sql_seconds", 0.0) * 1000:.1f};desc="{g.get("sql_queries", 0)} queries"'
+    )
+    with _lock:
+        _requests[(endpoint, request.method, response.status_code)] += 1
+        _latency[(endpoint, request.method)].observe(elapsed)
+        _per_request[endpoint].observe(g.get("sql_queries", 0))
+    return response
+
+
+# The start time rides on the statement's execution context: a statement
+# that fails never reaches after_cursor_execute, and its context (with the
+# timestamp) is simply dropped instead of lingering on the connection.
+def _before_cursor_execute(conn, cursor, statement, params, context, executemany):
+    context._metrics_t0 = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, params, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_t0
+    endpoint = _endpoint()
+    slow = elapsed * 1000 >= _slow_ms
+    with _lock:
+        _queries[endpoint] += 1
+        _query_seconds[endpoint] += elapsed
+        if slow:
+            _slow[endpoint] += 1
+    if has_request_context():
+        g.sql_queries = g.get("sql_queries", 0) + 1
+        g.sql_seconds = g.get("sql_seconds", 0.0) + elapsed
+    if slow:
+        route = f"{request.method} {request.full_path.rstrip('?')}" if has_request_context() else "-"
+        log.warning("slow query %.1f ms [%s → %s] %s",
+                    elapsed * 1000, endpoint, route, " ".join(statement.split())[:500])
+
+
+def init_metrics(app):
+    global _slow_ms
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    _slow_ms = app.config.get("SLOW_QUERY_MS", 200)
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------- exposition ----------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**kv):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in kv.items()) + "}"
+
+
+def _histogram_lines(name, key_names, series):
+    for key, h in sorted(series.items()):
+        labels = dict(zip(key_names, key if isinstance(key, tuple) else (key,)))
+        cumulative = 0
+        for le, n in zip(h.buckets, h.counts):
+            cumulative += n
+            yield f"{name}_bucket{_labels(**labels, le=le)} {cumulative}"
+        yield f"{name}_bucket{_labels(**labels, le='+Inf')} {h.count}"
+        yield f"{name}_sum{_labels(**labels)} {h.sum:.6f}"
+        yield f"{name}_count{_labels(**labels)} {h.count}"
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    out = []
+
+    def head(name, kind, text):
+        out.append(f"# HELP {name} {text}")
+        out.append(f"# TYPE {name} {kind}")
+
+    with _lock:
+        head("http_requests_total", "counter", "HTTP requests by endpoint, method and status.")
+        for (endpoint, method, status), n in sorted(_requests.items()):
+            out.append(f"http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {n}")
+
+        head("http_request_duration_seconds", "histogram", "Time spent in the view, per endpoint.")
+        out.extend(_histogram_lines("http_request_duration_seconds", ("endpoint", "method"), _latency))
+
+        head("db_queries_per_request", "histogram", "SQL statements issued per request.")
+        out.extend(_histogram_lines("db_queries_per_request", ("endpoint",), _per_request))
+
+        head("db_queries_total", "counter", "SQL statements executed.")
+        for endpoint, n in sorted(_queries.items()):
+            out.append(f"db_queries_total{_labels(endpoint=endpoint)} {n}")
+
+        head("db_query_seconds_total", "counter", "Time spent executing SQL.")
+        for endpoint, s in sorted(_query_seconds.items()):
+            out.append(f"db_query_seconds_total{_labels(endpoint=endpoint)} {s:.6f}")
+
+        head("db_slow_queries_total", "counter", "SQL statements slower than SLOW_QUERY_MS.")
+        for endpoint, n in sorted(_slow.items()):
+            out.append(f"db_slow_queries_total{_labels(endpoint=endpoint)} {n}")
+
+    return "\n".join(out) + "\n"
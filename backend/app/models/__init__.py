@@ -6,6 +6,10 @@ from .product     import Product
 from .batch       import Batch
 from .entry       import Entry, Payment
 from .inventory   import Inventory, InventoryEntry
+from .summary     import DailySales
+from .stock       import StockLevel
+from .version     import ResourceVersion
+from .job         import Job
 
 __all__ = (
     "Product",
@@ -14,4 +18,8 @@ __all__ = (
     "Payment",
     "Inventory",
     "InventoryEntry",
+    "DailySales",
+    "StockLevel",
+    "ResourceVersion",
+    "Job",
 )
\ No newline at end of file
@@ -1,14 +1,14 @@
-from app.extensions import db
+from ..extensions import db
 
 
 class Batch(db.Model):
     __tablename__ = "batch"
 
     id           = db.Column(db.Integer, primary_key=True)
-    date         = db.Column(db.Date,   nullable=False)  # Only date, no time
-    card_amount  = db.Column(db.Float,  default=0)
-    cash_amount  = db.Column(db.Float,  default=0)
-    total_amount = db.Column(db.Float,  default=0)
+    date         = db.Column(db.Date,   nullable=False)  # Only date, no time — one batch per day
+    card_amount  = db.Column(db.Integer, default=0)     # cents
+    cash_amount  = db.Column(db.Integer, default=0)
+    total_amount = db.Column(db.Integer, default=0)
 
     # One-to-many
     entries = db.relationship(
@@ -18,5 +18,9 @@ class Batch(db.Model):
         lazy=True,
     )
 
+    __table_args__ = (
+        db.Index("ux_batch_date", "date", unique=True),
+    )
+
     def __repr__(self) -> str:
         return f"<Batch {self.id} {self.date}>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from app.extensions import db
+from ..extensions import db
 
 
 class Entry(db.Model):
@@ -9,8 +9,8 @@ class Entry(db.Model):
     product_id = db.Column(db.Integer, db.ForeignKey("product.id"), nullable=False)
 
     qty      = db.Column(db.Integer, nullable=False)
-    price    = db.Column(db.Float,   nullable=False)
-    discount = db.Column(db.Float,   default=0)
+    price    = db.Column(db.Integer, nullable=False)    # cents
+    discount = db.Column(db.Integer, default=0)         # cents
     size     = db.Column(db.String(40), nullable=True)
 
     payments = db.relationship(
@@ -21,6 +21,10 @@ class Entry(db.Model):
     )
     product = db.relationship("Product")
 
+    __table_args__ = (
+        db.Index("ix_entry_batch_product", "batch_id", "product_id"),
+    )
+
     def __repr__(self) -> str:
         return f"<Entry {self.id} prod={self.product_id} qty={self.qty}>"
 
@@ -31,7 +35,11 @@ class Payment(db.Model):
     id          = db.Column(db.Integer, primary_key=True)
     entry_id    = db.Column(db.Integer, db.ForeignKey("entry.id"), nullable=False)
     payment_type = db.Column(db.String(10), nullable=False)
-    amount      = db.Column(db.Float, nullable=False)
+    amount      = db.Column(db.Integer, nullable=False)    # cents
+
+    __table_args__ = (
+        db.Index("ix_payment_entry", "entry_id"),
+    )
 
     def __repr__(self) -> str:
         return f"<Payment {self.id} {self.payment_type} {self.amount}>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from app.extensions import db
+from ..extensions import db
 
 
 class Inventory(db.Model):
@@ -7,7 +7,7 @@ class Inventory(db.Model):
     id           = db.Column(db.Integer, primary_key=True)
     date         = db.Column(db.Date,   nullable=False)
     qty_amount   = db.Column(db.Integer, nullable=False)
-    total_amount = db.Column(db.Float,   nullable=False)
+    total_amount = db.Column(db.Integer, nullable=False)    # cents
 
     entries = db.relationship(
         "InventoryEntry",
@@ -16,6 +16,10 @@ class Inventory(db.Model):
         lazy=True,
     )
 
+    __table_args__ = (
+        db.Index("ix_inventory_date", "date"),
+    )
+
     def __repr__(self) -> str:
         return f"<Inventory {self.id} {self.date}>"
 
@@ -30,5 +34,9 @@ class InventoryEntry(db.Model):
 
     product = db.relationship("Product")
 
+    __table_args__ = (
+        db.Index("ix_inventory_entry_inv_product", "inventory_id", "product_id"),
+    )
+
     def __repr__(self) -> str:
         return f"<InventoryEntry {self.id} prod={self.product_id} qty={self.qty}>"
\ No newline at end of file
@@ -0,0 +1,27 @@
+from ..extensions import db
+
+
+class Job(db.Model):
+    """Background job (see app/jobs.py); lives in the separate ``jobs`` SQLite file."""
+    __tablename__ = "job"
+    __bind_key__ = "jobs"
+
+    id          = db.Column(db.Integer, primary_key=True)
+    kind        = db.Column(db.String(40),  nullable=False)      # "inventory_import", "export", …
+    status      = db.Column(db.String(10),  nullable=False)      # queued | running | done | failed
+    params      = db.Column(db.JSON,        nullable=False)
+    progress    = db.Column(db.Integer,     nullable=False, default=0)   # rows processed so far
+    result      = db.Column(db.JSON,        nullable=True)
+    error       = db.Column(db.Text,        nullable=True)
+    file        = db.Column(db.String(255), nullable=True)      # downloadable output, if any
+    worker      = db.Column(db.Integer,     nullable=True)      # pid of the running process
+    created_at  = db.Column(db.DateTime,    nullable=False)     # UTC
+    started_at  = db.Column(db.DateTime,    nullable=True)
+    finished_at = db.Column(db.DateTime,    nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_job_status", "status", "id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} {self.kind} {self.status}>"
@@ -1,4 +1,6 @@
-from app.extensions import db
+from sqlalchemy import DDL, event
+
+from ..extensions import db
 
 
 class Product(db.Model):
@@ -6,8 +8,38 @@ class Product(db.Model):
 
     id        = db.Column(db.Integer, primary_key=True)
     name      = db.Column(db.String(80),  nullable=False)
-    price     = db.Column(db.Float,       nullable=False)   # Price per unit
+    price     = db.Column(db.Integer,     nullable=False)   # Price per unit, cents
     attr_num  = db.Column(db.String(40),  nullable=True)    # Optional attribute number
 
     def __repr__(self) -> str:            # optional, nice debugging
-        return f"<Product {self.id} {self.name}>"
\ No newline at end of file
+        return f"<Product {self.id} {self.name}>"
+
+
+# ---------- full-text index (app/search.py) ----------
+# product_search is an FTS5 index over product's own rows (external content):
+# the triggers keep it in step with every write, ORM or raw SQL.  Same SQL as
+# migration 0005_product_search; create_all() runs it for fresh databases.
+SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE product_search USING fts5(
+        name, attr_num, content='product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')""",
+    """CREATE TRIGGER product_search_ai AFTER INSERT ON product BEGIN
+        INSERT INTO product_search (rowid, name, attr_num)
+        VALUES (new.id, new.name, new.attr_num);
+    END""",
+    """CREATE TRIGGER product_search_ad AFTER DELETE ON product BEGIN
+        INSERT INTO product_search (product_search, rowid, name, attr_num)
+        VALUES ('delete', old.id, old.name, old.attr_num);
+    END""",
+    """CREATE TRIGGER product_search_au AFTER UPDATE OF id, name, attr_num ON product BEGIN
+        INSERT INTO product_search (product_search, rowid, name, attr_num)
+        VALUES ('delete', old.id, old.name, old.attr_num);
+        INSERT INTO product_search (rowid, name, attr_num)
+        VALUES (new.id, new.name, new.attr_num);
+    END""",
+)
+
+for _stmt in SEARCH_DDL:
+    event.listen(Product.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+event.listen(Product.__table__, "after_drop",
+             DDL("DROP TABLE IF EXISTS product_search").execute_if(dialect="sqlite"))
@@ -0,0 +1,14 @@
+from ..extensions import db
+
+
+class StockLevel(db.Model):
+    """Current stock per product: latest inventory count minus units sold since (app/stock.py)."""
+    __tablename__ = "stock_level"
+
+    product_id = db.Column(db.Integer, db.ForeignKey("product.id"), primary_key=True)
+    counted_on = db.Column(db.Date,    nullable=False)              # latest snapshot date
+    counted    = db.Column(db.Integer, nullable=False, default=0)   # qty in it (0 if not listed)
+    sold       = db.Column(db.Integer, nullable=False, default=0)   # units sold after counted_on
+
+    def __repr__(self) -> str:
+        return f"<StockLevel prod={self.product_id} on_hand={self.counted - self.sold}>"
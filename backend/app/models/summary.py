@@ -0,0 +1,20 @@
+from ..extensions import db
+
+
+class DailySales(db.Model):
+    """Per-day, per-product sales totals kept in step with Entry/Payment writes."""
+    __tablename__ = "daily_sales"
+
+    date       = db.Column(db.Date,    primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey("product.id"), primary_key=True)
+
+    entries    = db.Column(db.Integer, nullable=False, default=0)
+    units      = db.Column(db.Integer, nullable=False, default=0)
+    # money in cents
+    gross      = db.Column(db.Integer, nullable=False, default=0)   # qty × price
+    discounts  = db.Column(db.Integer, nullable=False, default=0)
+    card       = db.Column(db.Integer, nullable=False, default=0)
+    cash       = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DailySales {self.date} prod={self.product_id} units={self.units}>"
@@ -0,0 +1,13 @@
+from ..extensions import db
+
+
+class ResourceVersion(db.Model):
+    """Change counter per API resource, bumped in the same transaction as each write."""
+    __tablename__ = "resource_version"
+
+    name       = db.Column(db.String(40), primary_key=True)   # "products", "inventory", …
+    version    = db.Column(db.Integer,    nullable=False, default=0)
+    updated_at = db.Column(db.DateTime,   nullable=True)      # UTC
+
+    def __repr__(self) -> str:
+        return f"<ResourceVersion {self.name} v{self.version}>"
@@ -0,0 +1,35 @@
+"""
+Money is stored, summed and compared as integer cents.
+
+Every money column (prices, discounts, payments, batch / inventory totals,
+the daily_sales sums) is an INTEGER number of cents, so SQL SUMs are exact
+and nothing needs rounding on the way out.  The JSON API still speaks
+decimal dollars; values are converted exactly at the edge:
+
+   to_cents(19.99)   → 1999        (also "19.99", 20, Decimal("19.99"))
+   dollars(1999)     → 19.99
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+_CENT = Decimal(1)
+
+
+def to_cents(value) -> int:
+    """Dollars (number or numeric string) → int cents; raises ValueError."""
+    if isinstance(value, bool):
+        raise ValueError(f"invalid amount {value!r}")
+    if isinstance(value, int):
+        return value * 100
+    try:
+        amount = Decimal(str(value).strip())
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"invalid amount {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"invalid amount {value!r}")
+    # half-cent inputs round like a till would (0.005 → 1 cent)
+    return int((amount * 100).quantize(_CENT, rounding=ROUND_HALF_UP))
+
+
+def dollars(cents):
+    """int cents → dollars for JSON (None stays None)."""
+    return None if cents is None else cents / 100
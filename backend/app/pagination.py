@@ -0,0 +1,124 @@
+"""
+Keyset (cursor) pagination and field projection for list endpoints.
+
+   GET /api/batches?limit=50                → first 50 rows
+   GET /api/batches?limit=50&cursor=<tok>   → the 50 after that
+   GET /api/batches?fields=id,date          → only those keys per item
+   GET /api/entries?stream=1                → whole list as a streamed array
+
+The next page's token is returned in the ``X-Next-Cursor`` response header
+(absent on the last page).  Without ``limit``/``cursor`` the full list is
+returned as before.
+"""
+import base64
+import json
+from datetime import date
+
+from flask import jsonify
+from sqlalchemy import Date, Select, tuple_
+
+from .extensions import db
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT     = 1000
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def parse_page_args(args):
+    """
+    Read ``limit``, ``cursor`` and ``fields`` from request args.
+
+    Returns (limit | None, cursor | None, fields | None); raises ValueError
+    with a client-facing message on bad input.
+    """
+    limit = args.get("limit")
+    cursor = args.get("cursor")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    elif cursor:
+        limit = DEFAULT_LIMIT
+
+    fields = args.get("fields")
+    if fields:
+        fields = {f.strip() for f in fields.split(",") if f.strip()}
+    return limit, cursor or None, fields or None
+
+
+def wants_stream(args, limit, cursor):
+    """True for ``?stream=1``; raises ValueError if combined with paging."""
+    if not args.get("stream"):
+        return False
+    if limit or cursor:
+        raise ValueError("stream=1 can't be combined with limit or cursor")
+    return True
+
+
+def keyset_page(query, keys, cursor, limit, descending=False):
+    """
+    Order *query* (ORM Query or Core SELECT) by the *keys* columns and
+    return one page after *cursor*.
+
+    Returns (rows, next_cursor).  With ``limit=None`` every row is returned.
+    """
+    order = [k.desc() if descending else k.asc() for k in keys]
+    query = query.order_by(*order)
+
+    if cursor:
+        values = _decode_cursor(cursor, keys)
+        after = tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+        query = query.filter(after)
+
+    if limit is None:
+        return _all(query), None
+
+    rows = _all(query.limit(limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, _encode_cursor([getattr(last, k.key) for k in keys])
+
+
+def _all(query):
+    if isinstance(query, Select):        # plain rows, skips ORM result processing
+        return db.session.connection().execute(query).all()
+    return query.all()
+
+
+def project(item: dict, fields):
+    """Keep only the requested keys of a serialized item (all when fields is None)."""
+    if fields is None:
+        return item
+    return {k: v for k, v in item.items() if k in fields}
+
+
+def page_response(items, next_cursor):
+    resp = jsonify(items)
+    if next_cursor:
+        resp.headers[CURSOR_HEADER] = next_cursor
+    return resp
+
+
+# ---------- cursor codec ----------
+def _encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(token, keys):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        return [
+            date.fromisoformat(v) if isinstance(k.type, Date) else int(v)
+            for k, v in zip(keys, values)
+        ]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
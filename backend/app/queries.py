@@ -0,0 +1,117 @@
+"""
+Read-side query builders.
+
+List/detail endpoints select plain column rows on the session's connection
+(no ORM objects, identity map or ORM result processing) and fetch child
+rows with one IN-select per 500 parents, so
+serializing a batch / entry list / inventory range costs a fixed number of
+SELECTs no matter how many rows come back.  Product names and prices come
+from the in-process catalog (catalog.py), so products are never joined here:
+
+   conn = db.session.connection()
+   rows = conn.execute(entry_rows().where(Entry.batch_id == 1)).all()
+   pays = payments_by_entry([r.id for r in rows])
+   out  = serializers.entries(rows, catalog.products(), pays)
+
+``batches_query()`` still returns ORM objects for the write paths that need
+whole batches (summary deltas on update/delete).
+"""
+from collections import defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from .extensions import db
+from .models import Batch, Entry, Inventory, InventoryEntry, Payment
+
+IN_CHUNK = 500          # parents per child IN-select, well under SQLite's variable limit
+
+
+def _children(columns, fk, parent_ids):
+    """{parent_id: [row, …]} for the child rows whose *fk* is in *parent_ids*."""
+    out = defaultdict(list)
+    for i in range(0, len(parent_ids), IN_CHUNK):
+        chunk = parent_ids[i:i + IN_CHUNK]
+        stmt = select(fk, *columns).where(fk.in_(chunk)).order_by(fk, columns[0])
+        for parent_id, *row in db.session.connection().execute(stmt):
+            out[parent_id].append(row)
+    return out
+
+
+def partitions(stmt, size=IN_CHUNK):
+    """Run *stmt* with a server-side cursor; yields lists of up to *size* rows."""
+    result = db.session.connection().execute(stmt.execution_options(yield_per=size))
+    yield from result.partitions()
+
+
+# ---------- entries ----------
+ENTRY_COLUMNS = (Entry.id, Entry.batch_id, Entry.product_id, Entry.qty,
+                 Entry.price, Entry.discount, Entry.size)
+PAYMENT_COLUMNS = (Payment.id, Payment.payment_type, Payment.amount)
+
+
+def entry_rows():
+    """SELECT of the serialized entry columns (see serializers.entry)."""
+    return select(*ENTRY_COLUMNS)
+
+
+def payments_by_entry(entry_ids):
+    """{entry_id: [(id, payment_type, amount), …]}"""
+    return _children(PAYMENT_COLUMNS, Payment.entry_id, entry_ids)
+
+
+# ---------- batches ----------
+BATCH_COLUMNS = (Batch.id, Batch.date, Batch.card_amount, Batch.cash_amount, Batch.total_amount)
+
+
+def batch_rows():
+    return select(*BATCH_COLUMNS)
+
+
+def batches_query():
+    """Batch ORM objects with their entries and payments preloaded (write paths)."""
+    return Batch.query.options(
+        selectinload(Batch.entries).selectinload(Entry.payments),
+    )
+
+
+def sales_in_range(start_d, end_d):
+    """
+    Batches dated in [start_d, end_d] with their entries and payments, as
+    (batch rows by date, {batch_id: [entry row]}, {entry_id: [payment row]}).
+
+    Three SELECTs, each joined back to ``batch`` on the date range instead of
+    IN-lists of ids, so a month costs the same number of queries as a day.
+    """
+    conn = db.session.connection()
+    in_range = Batch.date.between(start_d, end_d)
+    batches = conn.execute(batch_rows().where(in_range).order_by(Batch.date)).all()
+
+    entries = defaultdict(list)
+    stmt = (entry_rows().join(Batch, Batch.id == Entry.batch_id)
+            .where(in_range).order_by(Entry.id))
+    for row in conn.execute(stmt):
+        entries[row.batch_id].append(row)
+
+    payments = defaultdict(list)
+    stmt = (select(Payment.entry_id, *PAYMENT_COLUMNS)
+            .join(Entry, Entry.id == Payment.entry_id)
+            .join(Batch, Batch.id == Entry.batch_id)
+            .where(in_range).order_by(Payment.id))
+    for entry_id, *row in conn.execute(stmt):
+        payments[entry_id].append(row)
+    return batches, entries, payments
+
+
+# ---------- inventory ----------
+INVENTORY_COLUMNS = (Inventory.id, Inventory.date, Inventory.qty_amount, Inventory.total_amount)
+ITEM_COLUMNS = (InventoryEntry.id, InventoryEntry.product_id, InventoryEntry.qty)
+
+
+def inventory_rows():
+    return select(*INVENTORY_COLUMNS)
+
+
+def items_by_inventory(inventory_ids):
+    """{inventory_id: [(id, product_id, qty), …]}"""
+    return _children(ITEM_COLUMNS, InventoryEntry.inventory_id, inventory_ids)
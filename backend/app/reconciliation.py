@@ -0,0 +1,140 @@
+"""
+Inventory vs. sales reconciliation, computed with pandas.
+
+Consecutive inventory snapshots (counted at close of their day) bound
+intervals; the units sold in each interval come from ``daily_sales``.  Both
+are loaded with ``pd.read_sql`` in chunks and the whole calculation is done
+on (interval × product) frames, never row by row in Python:
+
+   expected  = opening − sold
+   received  = max(closing − expected, 0)      stock that arrived (restocks)
+   shrinkage = max(expected − closing, 0)      stock that went missing
+
+Per product the intervals are summed, then
+
+   movement       = last snapshot − first snapshot
+   sell_through   = sold / (opening + received)
+   days_of_cover  = closing / (sold per day)
+
+A product missing from a snapshot counts as zero stock on that day.
+"""
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+
+from . import catalog
+from .extensions import db
+from .models import DailySales, Inventory, InventoryEntry
+
+COLUMNS = ("product_id", "name", "opening", "closing", "movement", "sold",
+           "received", "shrinkage", "shrinkage_value", "sell_through", "days_of_cover")
+
+
+# ---------- loading ----------
+def _read_chunks(stmt, chunk_size, columns):
+    """pd.read_sql in *chunk_size* pieces, concatenated (empty frame if no rows)."""
+    conn = db.session.connection()
+    chunks = list(pd.read_sql(stmt, conn, chunksize=chunk_size))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+
+
+def _snapshots(start_d, end_d, chunk_size):
+    """Stock matrix: one row per snapshot date, one column per product."""
+    stmt = (
+        select(Inventory.date, InventoryEntry.product_id,
+               func.sum(InventoryEntry.qty).label("qty"))
+        .join(InventoryEntry, InventoryEntry.inventory_id == Inventory.id)
+        .where(Inventory.date >= start_d, Inventory.date <= end_d)
+        .group_by(Inventory.date, InventoryEntry.product_id)
+    )
+    df = _read_chunks(stmt, chunk_size, ("date", "product_id", "qty"))
+    df["date"] = pd.to_datetime(df["date"])
+    return df.pivot_table(index="date", columns="product_id", values="qty",
+                          aggfunc="sum", fill_value=0).sort_index()
+
+
+def _sold(snap_dates, chunk_size):
+    """Units sold per (interval, product); interval i is (snap[i], snap[i+1]]."""
+    stmt = (
+        select(DailySales.date, DailySales.product_id, DailySales.units)
+        .where(DailySales.date > snap_dates[0].date(),
+               DailySales.date <= snap_dates[-1].date())
+    )
+    conn = db.session.connection()
+    total = None
+    for chunk in pd.read_sql(stmt, conn, chunksize=chunk_size):
+        dates = pd.to_datetime(chunk["date"]).to_numpy()
+        chunk["interval"] = np.searchsorted(snap_dates.to_numpy(), dates, side="left") - 1
+        part = chunk.groupby(["interval", "product_id"])["units"].sum()
+        total = part if total is None else total.add(part, fill_value=0)
+
+    index = range(len(snap_dates) - 1)
+    if total is None:
+        return pd.DataFrame(index=index)
+    return total.unstack(fill_value=0).reindex(index, fill_value=0)
+
+
+# ---------- reconciliation ----------
+def reconcile(start_d, end_d, chunk_size=50_000):
+    """
+    Reconcile the inventory snapshots in [start_d, end_d] against sales.
+    Raises ValueError if the range holds fewer than two snapshot dates.
+    """
+    stock = _snapshots(start_d, end_d, chunk_size)
+    if len(stock.index) < 2:
+        raise ValueError("need at least two inventory snapshots in range")
+
+    sold = _sold(stock.index, chunk_size)
+    products = stock.columns.union(sold.columns)
+    stock = stock.reindex(columns=products, fill_value=0)
+    sold = sold.reindex(columns=products, fill_value=0)
+
+    opening = stock.iloc[:-1].to_numpy(dtype=float)
+    closing = stock.iloc[1:].to_numpy(dtype=float)
+    sold_iv = sold.to_numpy(dtype=float)
+    diff = closing - (opening - sold_iv)
+
+    first, last = stock.iloc[0], stock.iloc[-1]
+    df = pd.DataFrame({
+        "product_id": products,
+        "opening": first.to_numpy(),
+        "closing": last.to_numpy(),
+        "sold": sold_iv.sum(axis=0),
+        "received": np.clip(diff, 0, None).sum(axis=0),
+        "shrinkage": np.clip(-diff, 0, None).sum(axis=0),
+    })
+    days = (stock.index[-1] - stock.index[0]).days
+
+    info = catalog.products()
+    df["name"] = df["product_id"].map(lambda pid: info[pid].name if pid in info else None)
+    price = df["product_id"].map(lambda pid: info[pid].price if pid in info else np.nan)
+    df["movement"] = df["closing"] - df["opening"]
+    shrinkage_cents = df["shrinkage"] * price                  # exact: whole cents
+    df["shrinkage_value"] = shrinkage_cents / 100
+    available = df["opening"] + df["received"]
+    df["sell_through"] = (df["sold"] / available.where(available > 0)).round(4)
+    daily_rate = df["sold"] / days
+    df["days_of_cover"] = (df["closing"] / daily_rate.where(daily_rate > 0)).round(1)
+
+    df = df[list(COLUMNS)].sort_values("product_id")
+    return {
+        "snapshots": [d.date().isoformat() for d in stock.index],
+        "days": days,
+        "rows": _records(df),
+        "totals": {
+            "opening": int(df["opening"].sum()),
+            "closing": int(df["closing"].sum()),
+            "sold": int(df["sold"].sum()),
+            "received": int(df["received"].sum()),
+            "shrinkage": int(df["shrinkage"].sum()),
+            "shrinkage_value": int(shrinkage_cents.sum()) / 100,
+        },
+    }
+
+
+def _records(df):
+    """DataFrame → JSON-ready dicts (ints stay ints, NaN becomes None)."""
+    for col in ("opening", "closing", "movement", "sold", "received", "shrinkage"):
+        df[col] = df[col].astype("int64")
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict("records")
@@ -5,10 +5,20 @@ from .products   import products_bp
 from .batches    import batches_bp
 from .entries    import entries_bp
 from .inventory  import inventory_bp
+from .reports    import reports_bp
+from .stock      import stock_bp
+from .exports    import exports_bp
+from .metrics    import metrics_bp
+from .jobs       import jobs_bp
 
 ALL_BLUEPRINTS = (
     products_bp,
     batches_bp,
     entries_bp,
     inventory_bp,
+    reports_bp,
+    stock_bp,
+    exports_bp,
+    metrics_bp,
+    jobs_bp,
 )
\ No newline at end of file
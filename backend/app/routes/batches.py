@@ -1,13 +1,22 @@
 from datetime import datetime
 
 from flask import Blueprint, request, jsonify
-from app.extensions import db
-from app.models import Batch, Entry, Payment
+from .. import catalog, serializers
+from ..extensions import db
+from ..exporter import csv_response, dataset, date_range_args
+from ..models import Batch, Entry, Payment
+from ..money import to_cents
+from ..pagination import keyset_page, page_response, parse_page_args, project
+from ..queries import (batch_rows, batches_query, entry_rows, payments_by_entry,
+                      sales_in_range)
+from ..summary import apply_delta, contributions
+from ..versions import bump, conditional
 
 batches_bp = Blueprint("batches", __name__, url_prefix="/api/batches")
 
 # ---------- helpers ----------
 DATE_FMT = "%Y-%m-%d"
+MAX_RANGE_DAYS = 92     # /range: a quarter at most, one response held in memory
 
 
 # ---------- endpoints ----------
@@ -18,85 +27,126 @@ def create_batch():
         batch_date = datetime.strptime(data["date"], DATE_FMT).date()
     except Exception:
         return jsonify({"error": "Invalid date format, use YYYY-MM-DD"}), 400
+    if Batch.query.filter_by(date=batch_date).first():
+        return jsonify({"error": "A batch already exists for this date"}), 409
 
     batch = Batch(date=batch_date)
     db.session.add(batch)
+    bump("sales")
     db.session.commit()
     return jsonify({"id": batch.id, "date": batch.date.isoformat()}), 201
 
 
 @batches_bp.get("")
+@conditional("sales")
 def list_batches():
-    batches = Batch.query.order_by(Batch.date.desc()).all()
-    return jsonify([{"id": b.id, "date": b.date.isoformat()} for b in batches])
+    try:
+        limit, cursor, fields = parse_page_args(request.args)
+        batches, next_cursor = keyset_page(
+            Batch.query, (Batch.date, Batch.id), cursor, limit, descending=True
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    return page_response(
+        [project({"id": b.id, "date": b.date.isoformat()}, fields) for b in batches],
+        next_cursor,
+    )
 
 
 @batches_bp.get("/by-date/<date>")
+@conditional("sales")
 def get_batch_by_date(date):
     try:
         batch_date = datetime.strptime(date, DATE_FMT).date()
     except Exception:
         return jsonify({"error": "Invalid date format, use YYYY-MM-DD"}), 400
 
-    batch = Batch.query.filter_by(date=batch_date).first()
+    conn = db.session.connection()
+    batch = conn.execute(batch_rows().where(Batch.date == batch_date)).first()
     if not batch:
         return jsonify({"error": "No batch found for this date"}), 404
 
-    entries_out = []
-    for e in batch.entries:
-        entries_out.append(
-            {
-                "id": e.id,
-                "batch_id": e.batch_id,
-                "product_id": e.product_id,
-                "product_name": e.product.name if e.product else None,
-                "qty": e.qty,
-                "price": e.price,
-                "discount": e.discount,
-                "size": e.size,
-                "payments": [
-                    {"id": p.id, "payment_type": p.payment_type, "amount": p.amount}
-                    for p in e.payments
-                ],
-            }
-        )
-
+    entries = conn.execute(
+        entry_rows().where(Entry.batch_id == batch.id).order_by(Entry.id)
+    ).all()
+    pays = payments_by_entry([e.id for e in entries])
     return jsonify(
-        {
-            "id": batch.id,
-            "date": batch.date.isoformat(),
-            "card_amount": batch.card_amount,
-            "cash_amount": batch.cash_amount,
-            "total_amount": batch.total_amount,
-            "entries": entries_out,
-        }
+        serializers.batch(batch, serializers.entries(entries, catalog.products(), pays))
+    )
+
+
+@batches_bp.get("/range")
+@conditional("sales")
+def get_batches_in_range():
+    """Every batch in [start, end] with entries and payments, as /by-date/<date> each."""
+    try:
+        start_d, end_d = date_range_args(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if end_d < start_d:
+        return jsonify({"error": "end must not be before start"}), 400
+    if (end_d - start_d).days >= MAX_RANGE_DAYS:
+        return jsonify({"error": f"range must span at most {MAX_RANGE_DAYS} days"}), 400
+
+    batches, entries, pays = sales_in_range(start_d, end_d)
+    products = catalog.products()
+    return jsonify([
+        serializers.batch(b, serializers.entries(entries.get(b.id, ()), products, pays))
+        for b in batches
+    ])
+
+
+@batches_bp.get("/export")
+def export_batches():
+    """Stream a CSV file: date, batch_id, card_amount, cash_amount, total_amount"""
+    try:
+        start_d, end_d = date_range_args(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    columns, stmt = dataset("batches", start_d, end_d)
+    return csv_response(
+        f"batches_{start_d:{DATE_FMT}}_{end_d:{DATE_FMT}}.csv",
+        columns, stmt,
+        lambda r: (r[0].strftime(DATE_FMT), *r[1:]),
     )
 
 
 @batches_bp.route("/<int:batch_id>", methods=["PUT", "PATCH"])
 def update_batch(batch_id):
-    batch = Batch.query.get_or_404(batch_id)
+    batch = batches_query().get_or_404(batch_id)
     data = request.get_json()
 
     if "date" in data:
         try:
-            batch.date = datetime.strptime(data["date"], DATE_FMT).date()
+            new_date = datetime.strptime(data["date"], DATE_FMT).date()
         except Exception:
             return jsonify({"error": "Invalid date format, use YYYY-MM-DD"}), 400
-    if "card_amount" in data:
-        batch.card_amount = data["card_amount"]
-    if "cash_amount" in data:
-        batch.cash_amount = data["cash_amount"]
-    if "total_amount" in data:
-        batch.total_amount = data["total_amount"]
+        if new_date != batch.date:
+            if Batch.query.filter_by(date=new_date).first():
+                return jsonify({"error": "A batch already exists for this date"}), 409
+            # every entry's sales move to the new day in daily_sales
+            before = contributions(batch.entries)
+            batch.date = new_date
+            apply_delta(before, contributions(batch.entries))
+    try:
+        for fld in ("card_amount", "cash_amount", "total_amount"):
+            if fld in data:
+                setattr(batch, fld, to_cents(data[fld]))
+    except ValueError:
+        return jsonify({"error": "Amounts must be numbers"}), 400
 
+    bump("sales")
     db.session.commit()
     return jsonify({"id": batch.id, "date": batch.date.isoformat()})
 
 
 @batches_bp.delete("/<int:batch_id>")
 def delete_batch(batch_id):
-    batch = Batch.query.get_or_404(batch_id)
+    batch = batches_query().get_or_404(batch_id)
+    apply_delta(contributions(batch.entries), {})
     db.session.delete(batch)
+    bump("sales")
     db.session.commit()
     return jsonify({"result": "deleted"})
\ No newline at end of file
@@ -1,64 +1,208 @@
 from flask import Blueprint, request, jsonify
-from app.extensions import db
-from app.models import Entry, Payment
+from sqlalchemy import insert
+
+from .. import catalog, serializers
+from ..extensions import db
+from ..exporter import csv_response, dataset, date_range_args
+from ..models import Batch, Entry, Payment
+from ..money import to_cents
+from ..json_stream import json_array
+from ..pagination import keyset_page, page_response, parse_page_args, wants_stream
+from ..queries import entry_rows, partitions, payments_by_entry
+from ..summary import apply_delta, contributions, row_contributions
+from ..versions import bump, conditional
 
 entries_bp = Blueprint("entries", __name__, url_prefix="/api/entries")
 
+ENTRY_FIELDS = ("product_id", "qty", "price", "discount", "size")
+MONEY_FIELDS = ("price", "discount")        # dollars in JSON, cents in the DB
+BULK_MAX = 5000
+
+
+# ---------- helpers ----------
+def _coerce_bulk_entry(raw):
+    """Validate one bulk entry dict; returns a clean copy or raises ValueError."""
+    try:
+        entry = {
+            "product_id": int(raw["product_id"]),
+            "qty": int(raw["qty"]),
+            "price": to_cents(raw["price"]),
+            "discount": to_cents(raw.get("discount") or 0),
+            "size": raw.get("size"),
+            "payments": [
+                {"payment_type": str(p["payment_type"]), "amount": to_cents(p["amount"])}
+                for p in raw.get("payments", [])
+            ],
+        }
+    except (KeyError, ValueError, TypeError):
+        raise ValueError("needs product_id, qty, price and payments[{payment_type, amount}]")
+    if entry["product_id"] not in catalog.products():
+        raise ValueError(f"Unknown product_id {entry['product_id']}")
+    return entry
+
+
+def _money_error():
+    return jsonify({"error": "price, discount and payment amounts must be numbers"}), 400
+
 
 @entries_bp.post("")
 def create_entry():
     data = request.get_json()
+    try:
+        price = to_cents(data["price"])
+        discount = to_cents(data.get("discount") or 0)
+        amounts = [to_cents(p["amount"]) for p in data["payments"]]
+    except ValueError:
+        return _money_error()
+
     entry = Entry(
         batch_id=data["batch_id"],
         product_id=data["product_id"],
         qty=data["qty"],
-        price=data["price"],
-        discount=data.get("discount", 0),
+        price=price,
+        discount=discount,
         size=data.get("size"),
     )
     db.session.add(entry)
-    db.session.commit()
+    db.session.flush()
 
-    for p in data["payments"]:
-        pay = Payment(entry_id=entry.id, payment_type=p["payment_type"], amount=p["amount"])
+    for p, amount in zip(data["payments"], amounts):
+        pay = Payment(entry_id=entry.id, payment_type=p["payment_type"], amount=amount)
         db.session.add(pay)
 
+    db.session.flush()
+    db.session.expire(entry)                 # pick up the payments just added
+    apply_delta({}, contributions([entry]))
+    bump("sales")
     db.session.commit()
     return jsonify({"id": entry.id}), 201
 
 
+@entries_bp.post("/bulk")
+def create_entries_bulk():
+    """
+    Create many entries (with nested payments) for one batch in a single
+    transaction:
+
+    { "batch_id": 1,
+      "entries": [{"product_id": 3, "qty": 2, "price": 9.5, "discount": 0,
+                   "size": "M", "payments": [{"payment_type": "card", "amount": 19}]},
+                  …] }
+
+    Returns the new entry ids in request order.
+    """
+    data = request.get_json(silent=True) or {}
+    raw_entries = data.get("entries")
+    if "batch_id" not in data or not isinstance(raw_entries, list) or not raw_entries:
+        return jsonify({"error": "batch_id and a non-empty entries list required"}), 400
+    if len(raw_entries) > BULK_MAX:
+        return jsonify({"error": f"At most {BULK_MAX} entries per request"}), 400
+
+    batch = db.session.get(Batch, data["batch_id"])
+    if not batch:
+        return jsonify({"error": f"Unknown batch_id {data['batch_id']}"}), 422
+
+    entries = []
+    for i, raw in enumerate(raw_entries):
+        try:
+            entries.append(_coerce_bulk_entry(raw))
+        except ValueError as exc:
+            return jsonify({"error": f"entries[{i}]: {exc}"}), 422
+
+    # SQLite returns RETURNING rows in no set order (sort_by_parameter_order
+    # would fall back to one INSERT per row), but each multi-row INSERT
+    # numbers its rows in VALUES order, so the sorted ids follow *entries*
+    ids = sorted(db.session.execute(
+        insert(Entry).returning(Entry.id),
+        [{"batch_id": batch.id, **{f: e[f] for f in ENTRY_FIELDS}} for e in entries],
+    ).scalars())
+    payments = [{"entry_id": eid, **p} for eid, e in zip(ids, entries) for p in e["payments"]]
+    if payments:
+        db.session.execute(insert(Payment), payments)
+
+    apply_delta({}, row_contributions(batch.date, entries))
+    bump("sales")
+    db.session.commit()
+    return jsonify({"ids": ids}), 201
+
+
 @entries_bp.get("")
+@conditional("sales")
 def list_entries():
     batch_id = request.args.get("batch_id")
-    query = Entry.query
+    try:
+        limit, cursor, fields = parse_page_args(request.args)
+        stream = wants_stream(request.args, limit, cursor)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    query = entry_rows()
     if batch_id:
-        query = query.filter_by(batch_id=batch_id)
-
-    result = []
-    for e in query.all():
-        result.append(
-            {
-                "id": e.id,
-                "batch_id": e.batch_id,
-                "product_id": e.product_id,
-                "product_name": e.product.name if e.product else None,
-                "qty": e.qty,
-                "price": e.price,
-                "discount": e.discount,
-                "size": e.size,
-                "payments": [
-                    {"id": p.id, "payment_type": p.payment_type, "amount": p.amount}
-                    for p in e.payments
-                ],
-            }
-        )
-    return jsonify(result)
+        query = query.where(Entry.batch_id == batch_id)
+    want_pays = fields is None or "payments" in fields
+
+    if stream:
+        def chunks():
+            products = catalog.products()
+            for rows in partitions(query.order_by(Entry.id)):
+                pays = payments_by_entry([r.id for r in rows]) if want_pays else None
+                yield serializers.entries(rows, products, pays, fields)
+        return json_array(chunks())
+
+    try:
+        rows, next_cursor = keyset_page(query, (Entry.id,), cursor, limit)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    pays = payments_by_entry([r.id for r in rows]) if want_pays else None
+    return page_response(
+        serializers.entries(rows, catalog.products(), pays, fields), next_cursor
+    )
+
+
+@entries_bp.get("/export")
+def export_entries():
+    """
+    Stream a CSV file:
+    date, batch_id, entry_id, product_id, product_name, qty, price, discount, size
+    """
+    return _export_csv("entries")
+
+
+@entries_bp.get("/payments/export")
+def export_payments():
+    """Stream a CSV file: date, batch_id, entry_id, payment_id, payment_type, amount"""
+    return _export_csv("payments")
+
+
+def _export_csv(name):
+    try:
+        start_d, end_d = date_range_args(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    columns, stmt = dataset(name, start_d, end_d)
+    return csv_response(
+        f"{name}_{start_d.isoformat()}_{end_d.isoformat()}.csv",
+        columns, stmt,
+        lambda r: (r[0].isoformat(), *r[1:]),
+    )
 
 
 @entries_bp.route("/<int:entry_id>", methods=["PUT", "PATCH"])
 def update_entry(entry_id):
     entry = Entry.query.get_or_404(entry_id)
     data = request.get_json()
+    try:
+        for fld in MONEY_FIELDS:
+            if data.get(fld) is not None:
+                data[fld] = to_cents(data[fld])
+        for p in data.get("payments", ()):
+            if "amount" in p:
+                p["amount"] = to_cents(p["amount"])
+    except ValueError:
+        return _money_error()
+    before = contributions([entry])
 
     # ---- entry fields ----
     for fld in ("batch_id", "product_id", "qty", "price", "discount", "size"):
@@ -89,6 +233,10 @@ def update_entry(entry_id):
             if pay.id not in seen_ids:
                 db.session.delete(pay)
 
+    db.session.flush()
+    db.session.expire(entry)                 # reload batch & payments as written
+    apply_delta(before, contributions([entry]))
+    bump("sales")
     db.session.commit()
     return jsonify({"id": entry.id})
 
@@ -96,6 +244,8 @@ def update_entry(entry_id):
 @entries_bp.delete("/<int:entry_id>")
 def delete_entry(entry_id):
     entry = Entry.query.get_or_404(entry_id)
+    apply_delta(contributions([entry]), {})
     db.session.delete(entry)
+    bump("sales")
     db.session.commit()
     return jsonify({"result": "deleted"})
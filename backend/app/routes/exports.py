@@ -0,0 +1,77 @@
+import tempfile
+
+from flask import Blueprint, request, jsonify, send_file, current_app
+
+from .. import jobs
+from ..columnar import FORMATS, write_dataset
+from ..exporter import DATASETS, date_range_args
+
+exports_bp = Blueprint("exports", __name__, url_prefix="/api/exports")
+
+MIMETYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow":   "application/vnd.apache.arrow.file",
+}
+
+
+def _export_args(name):
+    """((fmt, start_d, end_d), None) from the request, or (None, error response)."""
+    fmt = request.args.get("format", "parquet")
+    if name not in DATASETS:
+        return None, (jsonify({"error": f"Unknown dataset, use one of {', '.join(DATASETS)}"}), 404)
+    if fmt not in FORMATS:
+        return None, (jsonify({"error": f"format must be one of {', '.join(FORMATS)}"}), 400)
+    try:
+        start_d, end_d = date_range_args(request.args)
+    except ValueError as exc:
+        return None, (jsonify({"error": str(exc)}), 400)
+    return (fmt, start_d, end_d), None
+
+
+@exports_bp.get("/<name>")
+def export_columnar(name):
+    """
+    Download a dataset (batches | entries | payments | inventory) for a date
+    range as Parquet (default) or Arrow IPC:
+
+       GET /api/exports/entries?start=2024-01-01&end=2024-12-31&format=parquet
+
+    The file is built in a temp file, row group by row group, then streamed.
+    For ranges too big to build within a request, POST the same URL instead.
+    """
+    args, error = _export_args(name)
+    if error:
+        return error
+    fmt, start_d, end_d = args
+
+    out = tempfile.TemporaryFile()
+    try:
+        write_dataset(name, start_d, end_d, out, fmt,
+                      rows_per_batch=current_app.config["COLUMNAR_ROW_GROUP"])
+    except ImportError:
+        out.close()
+        return jsonify({"error": "pyarrow is not installed on the server"}), 501
+    out.seek(0)
+
+    return send_file(
+        out,
+        mimetype=MIMETYPES[fmt],
+        as_attachment=True,
+        download_name=f"{name}_{start_d.isoformat()}_{end_d.isoformat()}{FORMATS[fmt]}",
+    )
+
+
+@exports_bp.post("/<name>")
+def queue_export(name):
+    """
+    Build the same file as a background job; answers 202 with the job, whose
+    ``download`` URL serves the file once it is done (see /api/jobs).
+    """
+    args, error = _export_args(name)
+    if error:
+        return error
+    fmt, start_d, end_d = args
+    return jobs.accepted(jobs.submit("export", {
+        "dataset": name, "format": fmt,
+        "start": start_d.isoformat(), "end": end_d.isoformat(),
+    }))
@@ -1,11 +1,22 @@
 from datetime import datetime
 
-from flask import Blueprint, request, jsonify , Response
-from app.extensions import db
-from app.models import Inventory, InventoryEntry, Product
+from flask import Blueprint, request, jsonify , Response, current_app, abort
+from sqlalchemy import insert
+
+from .. import catalog, jobs, serializers, stock
+from ..extensions import db
+from ..exporter import csv_response, dataset, date_range_args
+from ..importer import import_csv_stream
+from ..inventory_sync import inventories_for_dates, sync_items
+from ..models import Inventory, InventoryEntry
+from ..json_stream import json_array
+from ..pagination import keyset_page, page_response, parse_page_args, wants_stream
+from ..queries import inventory_rows, items_by_inventory, partitions
+from ..versions import bump, conditional
 
 import io
 import csv
+import uuid
 
 inventory_bp = Blueprint("inventory", __name__, url_prefix="/api/inventory")
 
@@ -19,28 +30,70 @@ def _parse_date(value, field):
         return jsonify({"error": f"Invalid {field} format, expected YYYY-MM-DD"}), 400
 
 
-def _inv_to_dict(inv: Inventory):
-    return {
-        "id": inv.id,
-        "date": inv.date.strftime(DATE_FMT),
-        "qty": inv.qty_amount,
-        "total": round(inv.total_amount, 2),
-        "items": [
-            {
-                "id": e.id,
-                "product_id": e.product.id,
-                "attrNumber": e.product.attr_num or "",
-                "name": e.product.name,
-                "price": round(e.product.price, 2),
-                "qty": e.qty,
-            }
-            for e in inv.entries
-        ],
-    }
+def _serialize_inventories(rows, fields):
+    products = catalog.products()
+    if fields is not None and "items" not in fields:
+        return [serializers.inventory(r, products, None, fields) for r in rows]
+    items = items_by_inventory([r.id for r in rows])
+    return [serializers.inventory(r, products, items.get(r.id, ()), fields) for r in rows]
+
+
+def _inventory_chunks(query, fields):
+    # inventories carry hundreds of items each, so keep partitions small
+    for rows in partitions(query.order_by(Inventory.date, Inventory.id), 10):
+        yield _serialize_inventories(rows, fields)
+
+
+def _inventory_json(inv_id):
+    """One inventory with its items, serialized; 404 if it doesn't exist."""
+    row = db.session.connection().execute(inventory_rows().where(Inventory.id == inv_id)).first()
+    if row is None:
+        abort(404)
+    items = items_by_inventory([inv_id])
+    return serializers.inventory(row, catalog.products(), items.get(inv_id, ()))
+
+
+def _coerce_items(items):
+    """[{product_id, qty}, …] → [(product_id, qty), …] or None if malformed."""
+    try:
+        return [(int(it["product_id"]), int(it["qty"])) for it in items]
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def _first_unknown(items, products):
+    """Return the first product_id in *items* missing from *products*, else None."""
+    return next((pid for pid, _ in items if pid not in products), None)
+
+
+def _totals(items, products):
+    """(qty_amount, total_amount) for a list of (product_id, qty) pairs."""
+    return (
+        sum(qty for _, qty in items),
+        sum(qty * products[pid].price for pid, qty in items),
+    )
+
+
+def _new_inventory(inv_date, items, products) -> Inventory:
+    """Build an Inventory row with totals precomputed from *items*."""
+    qty_amount, total_amount = _totals(items, products)
+    return Inventory(date=inv_date, qty_amount=qty_amount, total_amount=total_amount)
+
+
+def _entry_rows(inv_id, items):
+    """Parameter dicts for a bulk INSERT of *items* under inventory *inv_id*."""
+    return [{"inventory_id": inv_id, "product_id": pid, "qty": qty}
+            for pid, qty in items]
+
+
+def _bulk_insert_entries(rows):
+    if rows:
+        db.session.execute(insert(InventoryEntry), rows)
 
 
 # -------- endpoints --------
 @inventory_bp.get("")
+@conditional("inventory")
 def list_inventory():
     start = request.args.get("start")
     end = request.args.get("end")
@@ -50,18 +103,22 @@ def list_inventory():
     start_d = _parse_date(start, "start")
     end_d = _parse_date(end, "end")
 
-    inventories = (
-        Inventory.query.filter(Inventory.date >= start_d, Inventory.date <= end_d)
-        .order_by(Inventory.date.asc())
-        .all()
-    )
-    return jsonify([_inv_to_dict(i) for i in inventories]), 200
+    try:
+        limit, cursor, fields = parse_page_args(request.args)
+        query = inventory_rows().where(Inventory.date >= start_d, Inventory.date <= end_d)
+        if wants_stream(request.args, limit, cursor):
+            return json_array(_inventory_chunks(query, fields))
+        rows, next_cursor = keyset_page(query, (Inventory.date, Inventory.id), cursor, limit)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    return page_response(_serialize_inventories(rows, fields), next_cursor), 200
 
 
 @inventory_bp.get("/<int:inv_id>")
+@conditional("inventory")
 def get_inventory(inv_id):
-    inv = Inventory.query.get_or_404(inv_id)
-    return jsonify(_inv_to_dict(inv)), 200
+    return jsonify(_inventory_json(inv_id)), 200
 
 
 @inventory_bp.post("")
@@ -70,28 +127,23 @@ def create_inventory():
     if not data or "date" not in data or "items" not in data:
         return jsonify({"error": "date and items required"}), 400
 
-    inv = Inventory(date=_parse_date(data["date"], "date"), qty_amount=0, total_amount=0)
-
-    for item in data["items"]:
-        try:
-            product_id = item["product_id"]
-            qty = int(item["qty"])
-        except (KeyError, ValueError, TypeError):
-            return jsonify({"error": "Each item needs product_id & qty"}), 400
-
-        prod = Product.query.get(product_id)
-        if not prod:
-            return jsonify({"error": f"Unknown product_id {product_id}"}), 422
-
-        entry = InventoryEntry(product_id=prod.id, qty=qty)
-        inv.entries.append(entry)
+    items = _coerce_items(data["items"])
+    if items is None:
+        return jsonify({"error": "Each item needs product_id & qty"}), 400
 
-        inv.qty_amount += qty
-        inv.total_amount += qty * prod.price
+    products = catalog.products()
+    unknown = _first_unknown(items, products)
+    if unknown is not None:
+        return jsonify({"error": f"Unknown product_id {unknown}"}), 422
 
+    inv = _new_inventory(_parse_date(data["date"], "date"), items, products)
     db.session.add(inv)
+    db.session.flush()
+    _bulk_insert_entries(_entry_rows(inv.id, items))
+    stock.inventories_changed([inv.date])
+    bump("inventory")
     db.session.commit()
-    return jsonify(_inv_to_dict(inv)), 201
+    return jsonify(_inventory_json(inv.id)), 201
 
 
 @inventory_bp.put("/<int:inv_id>")
@@ -101,37 +153,31 @@ def update_inventory(inv_id):
     if not data or "date" not in data or "items" not in data:
         return jsonify({"error": "date and items required"}), 400
 
-    inv.date = _parse_date(data["date"], "date")
-    inv.qty_amount = 0
-    inv.total_amount = 0
-
-    InventoryEntry.query.filter_by(inventory_id=inv.id).delete()
-
-    for item in data["items"]:
-        try:
-            product_id = item["product_id"]
-            qty = int(item["qty"])
-        except (KeyError, ValueError, TypeError):
-            return jsonify({"error": "Each item needs product_id & qty"}), 400
-
-        prod = Product.query.get(product_id)
-        if not prod:
-            return jsonify({"error": f"Unknown product_id {product_id}"}), 422
+    items = _coerce_items(data["items"])
+    if items is None:
+        return jsonify({"error": "Each item needs product_id & qty"}), 400
 
-        entry = InventoryEntry(product_id=prod.id, qty=qty)
-        inv.entries.append(entry)
-
-        inv.qty_amount += qty
-        inv.total_amount += qty * prod.price
+    products = catalog.products()
+    unknown = _first_unknown(items, products)
+    if unknown is not None:
+        return jsonify({"error": f"Unknown product_id {unknown}"}), 422
 
+    old_date = inv.date
+    inv.date = _parse_date(data["date"], "date")
+    sync_items({inv.id: items})             # only changed items are written
+    stock.inventories_changed([old_date, inv.date])
+    bump("inventory")
     db.session.commit()
-    return jsonify(_inv_to_dict(inv)), 200
+    return jsonify(_inventory_json(inv_id)), 200
 
 
 @inventory_bp.delete("/<int:inv_id>")
 def delete_inventory(inv_id):
     inv = Inventory.query.get_or_404(inv_id)
     db.session.delete(inv)
+    db.session.flush()
+    stock.inventories_changed([inv.date])
+    bump("inventory")
     db.session.commit()
     return jsonify({"result": "deleted"}), 204
 
@@ -139,7 +185,11 @@ def delete_inventory(inv_id):
 @inventory_bp.delete("/items/<int:item_id>")
 def delete_inventory_item(item_id):
     item = InventoryEntry.query.get_or_404(item_id)
+    inv_date = item.inventory.date
     db.session.delete(item)
+    db.session.flush()
+    stock.inventories_changed([inv_date])
+    bump("inventory")
     db.session.commit()
     return jsonify({"result": "deleted"}), 204
 
@@ -150,53 +200,26 @@ def export_inventory():
     """
     Stream a CSV file:
     date, inventory_id, item_id, product_id, attr_num, name, price, qty
-    """
-    start = request.args.get("start")
-    end   = request.args.get("end")
-    if not (start and end):
-        return jsonify({"error": "start and end query params required"}), 400
 
+    One joined SELECT read with a server-side cursor, written out in
+    EXPORT_CHUNK_BYTES pieces.
+    """
     try:
-        start_d = datetime.strptime(start, DATE_FMT).date()
-        end_d   = datetime.strptime(end,   DATE_FMT).date()
-    except Exception:
-        return jsonify({"error": "Invalid date format, use YYYY-MM-DD"}), 400
-
-    # generator yields rows → streamed response (doesn't load everything in RAM)
-    def generate():
-        OUT = io.StringIO()
-        writer = csv.writer(OUT)
-        writer.writerow(["date", "inventory_id", "item_id",
-                         "product_id", "attr_num", "name",
-                         "price", "qty"])
-        yield OUT.getvalue(); OUT.seek(0); OUT.truncate(0)
-
-        q = (
-            Inventory.query
-            .filter(Inventory.date >= start_d, Inventory.date <= end_d)
-            .order_by(Inventory.date.asc())
-        )
-        for inv in q:
-            for item in inv.entries:
-                writer.writerow([
-                    inv.date.strftime(DATE_FMT),
-                    inv.id,
-                    item.id,
-                    item.product.id,
-                    item.product.attr_num or "",
-                    item.product.name,
-                    f"{item.product.price:.2f}",
-                    item.qty
-                ])
-                yield OUT.getvalue()
-                OUT.seek(0); OUT.truncate(0)
+        start_d, end_d = date_range_args(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
-    headers = {
-        "Content-Disposition":
-            f'attachment; filename="inventory_{start}_{end}.csv"',
-        "Content-Type": "text/csv"
-    }
-    return Response(generate(), headers=headers)
+    columns, stmt = dataset("inventory", start_d, end_d)
+
+    def row(r):
+        inv_date, inv_id, item_id, prod_id, attr_num, name, price, qty = r
+        return (inv_date.strftime(DATE_FMT), inv_id, item_id, prod_id,
+                attr_num or "", name, f"{price:.2f}", qty)
+
+    return csv_response(
+        f"inventory_{start_d:{DATE_FMT}}_{end_d:{DATE_FMT}}.csv",
+        columns, stmt, row,
+    )
 
 # ---------- IMPORT ----------
 @inventory_bp.post("/import")
@@ -209,73 +232,90 @@ def import_inventory():
         "items":[{"product_id":1,"qty":8}, …] },
       …
     ]
-    Creates or replaces inventories on matching date.
+    Creates inventories, or updates the one on a matching date in place
+    (only items whose qty changed, or that appear / disappear, are written).
+
+    Add ``?stream=1`` to a CSV upload to decode and write it incrementally
+    (bounded memory); row errors are then reported with their line numbers.
+    ``?async=1`` does the same as a background job: the upload is saved and
+    the response is a 202 with the job to poll (see /api/jobs).
     """
+    if request.args.get("async"):
+        if "file" not in request.files:
+            return jsonify({"error": "async import needs a CSV file (field name: file)"}), 400
+        return _queue_csv_import(request.files["file"])
+
     # ---- 1) CSV ----
     if "file" in request.files:
         f = request.files["file"]
+        if request.args.get("stream"):
+            return _import_csv_streaming(f)
+
         stream = io.StringIO(f.stream.read().decode("utf-8"))
         reader = csv.DictReader(stream)
-        rows_by_date: dict[str, list[dict]] = {}
-        for row in reader:
-            date = row["date"]
-            rows_by_date.setdefault(date, []).append(row)
-
-        created = []
-        for date, rows in rows_by_date.items():
-            inv_date = datetime.strptime(date, DATE_FMT).date()
-            # delete existing inventory for that date (optional rule)
-            Inventory.query.filter_by(date=inv_date).delete()
-
-            inv = Inventory(date=inv_date, qty_amount=0, total_amount=0)
-            for r in rows:
-                prod = Product.query.get(int(r["product_id"]))
-                if not prod:
-                    db.session.rollback()
-                    return jsonify({"error": f"Unknown product {r['product_id']}"}), 422
-                qty = int(r["qty"])
-                inv_entry = InventoryEntry(product_id=prod.id, qty=qty)
-                inv.entries.append(inv_entry)
-                inv.qty_amount   += qty
-                inv.total_amount += qty * prod.price
-
-            db.session.add(inv)
-            created.append(inv_date.strftime(DATE_FMT))
-
-        db.session.commit()
-        return jsonify({"imported_dates": created}), 201
+        items_by_date: dict = {}
+        for line_no, row in enumerate(reader, start=2):
+            try:
+                inv_date = datetime.strptime(row["date"], DATE_FMT).date()
+                item = (int(row["product_id"]), int(row["qty"]))
+            except (KeyError, ValueError, TypeError):
+                return jsonify({"error": f"Invalid row on line {line_no}"}), 400
+            items_by_date.setdefault(inv_date, []).append(item)
 
     # ---- 2) JSON ----
-    data = request.get_json(silent=True)
-    if not data:
-        return jsonify({"error": "CSV file (field name: file) or JSON body required"}), 400
-
-    imported = []
-    for block in data:
-        try:
-            inv_date = datetime.strptime(block["date"], DATE_FMT).date()
-            items = block["items"]
-        except Exception:
-            return jsonify({"error": "Invalid JSON shape"}), 400
-
-        Inventory.query.filter_by(date=inv_date).delete()
-
-        inv = Inventory(date=inv_date, qty_amount=0, total_amount=0)
-        for it in items:
-            prod = Product.query.get(it["product_id"])
-            if not prod:
-                db.session.rollback()
-                return jsonify({"error": f"Unknown product {it['product_id']}"}), 422
-            qty = int(it["qty"])
-            inv.entries.append(InventoryEntry(product_id=prod.id, qty=qty))
-            inv.qty_amount   += qty
-            inv.total_amount += qty * prod.price
-
-        db.session.add(inv)
-        imported.append(inv_date.strftime(DATE_FMT))
+    else:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"error": "CSV file (field name: file) or JSON body required"}), 400
+
+        items_by_date = {}
+        for block in data:
+            try:
+                inv_date = datetime.strptime(block["date"], DATE_FMT).date()
+                items = _coerce_items(block["items"])
+            except Exception:
+                items = None
+            if items is None:
+                return jsonify({"error": "Invalid JSON shape"}), 400
+            items_by_date[inv_date] = items     # later block for a date wins
+
+    # ---- validate every product up front, then write in one transaction ----
+    all_items = [it for items in items_by_date.values() for it in items]
+    products = catalog.products()
+    unknown = _first_unknown(all_items, products)
+    if unknown is not None:
+        return jsonify({"error": f"Unknown product {unknown}"}), 422
+
+    # one inventory per date (created if missing), then diff its items
+    inv_ids = inventories_for_dates(list(items_by_date))
+    changes = sync_items({inv_ids[d]: items for d, items in items_by_date.items()})
+    stock.inventories_changed(list(items_by_date))
+    bump("inventory")
+    db.session.commit()
+    return jsonify({"imported_dates": [d.strftime(DATE_FMT) for d in items_by_date],
+                    "items": changes}), 201
+
+def _import_csv_streaming(f):
+    log = current_app.logger
+    result = import_csv_stream(
+        f.stream,
+        chunk_size=current_app.config["INVENTORY_IMPORT_CHUNK"],
+        on_progress=lambda n: log.info("inventory import: %d rows read", n),
+    )
+    if result["error_count"]:
+        db.session.rollback()
+        return jsonify({"error": "Import rejected, nothing was saved", **result}), 422
 
+    bump("inventory")
     db.session.commit()
-    return jsonify({"imported_dates": imported}), 201
+    return jsonify(result), 201
+
+
+def _queue_csv_import(f):
+    upload = f"upload-{uuid.uuid4().hex}.csv"
+    f.save(jobs.job_dir() / upload)
+    return jobs.accepted(jobs.submit("inventory_import", {"upload": upload, "filename": f.filename}))
+
 
 @inventory_bp.get("/import-template")
 def inventory_import_template():
@@ -0,0 +1,64 @@
+from flask import Blueprint, request, jsonify, send_file
+
+from .. import jobs, serializers
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
+
+STATUSES = ("queued", "running", "done", "failed")
+MAX_LIST = 200
+
+
+@jobs_bp.get("")
+def list_jobs():
+    """Newest jobs first; ``?status=queued|running|done|failed``, ``?limit=`` (default 50)."""
+    status = request.args.get("status")
+    if status and status not in STATUSES:
+        return jsonify({"error": f"status must be one of {', '.join(STATUSES)}"}), 400
+    try:
+        limit = int(request.args.get("limit", 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= limit <= MAX_LIST:
+        return jsonify({"error": f"limit must be between 1 and {MAX_LIST}"}), 400
+    return jsonify([serializers.job(r) for r in jobs.recent(status, limit)])
+
+
+@jobs_bp.get("/<int:job_id>")
+def get_job(job_id):
+    """
+    Poll a job: ``status`` goes queued → running → done | failed,
+    ``progress`` counts rows processed so far, ``result`` / ``error`` are
+    set when it finishes.
+    """
+    row = jobs.get(job_id)
+    if row is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(serializers.job(row))
+
+
+@jobs_bp.get("/<int:job_id>/file")
+def get_job_file(job_id):
+    """Download the file a finished job produced (exports)."""
+    row = jobs.get(job_id)
+    if row is None or not row.file:
+        return jsonify({"error": "Job has no file"}), 404
+    path = jobs.job_dir() / row.file
+    if not path.exists():
+        return jsonify({"error": "Job file is gone"}), 410
+    return send_file(path, as_attachment=True, download_name=row.file.partition("-")[2])
+
+
+@jobs_bp.delete("/<int:job_id>")
+def delete_job(job_id):
+    """Cancel a queued job, or forget a finished one and its file."""
+    if jobs.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not jobs.remove(job_id):
+        return jsonify({"error": "Job is running"}), 409
+    return jsonify({"result": "deleted"})
+
+
+@jobs_bp.post("/rebuild-summary")
+def queue_rebuild_summary():
+    """Recompute the daily_sales summary in the background (see `flask rebuild-summary`)."""
+    return jobs.accepted(jobs.submit("rebuild_summary", {}))
@@ -0,0 +1,11 @@
+from flask import Blueprint, Response
+
+from ..metrics import render
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.get("/metrics")
+def metrics():
+    """Prometheus scrape target (latency, status codes, SQL counts/time)."""
+    return Response(render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
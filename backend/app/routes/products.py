@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
-from app.extensions import db
-from app.models import Product
+from .. import catalog, search
+from ..extensions import db
+from ..money import dollars, to_cents
+from ..models import Product
+from ..pagination import keyset_page, page_response, parse_page_args, project
+from ..versions import bump, conditional
 
 products_bp = Blueprint("products", __name__, url_prefix="/api/products")
 
@@ -14,25 +18,57 @@ def create_product():
 
     if not name or price is None:
         return jsonify({"error": "Name and price are required"}), 400
+    try:
+        price = to_cents(price)
+    except ValueError:
+        return jsonify({"error": "price must be a number"}), 400
 
     prod = Product(name=name, price=price, attr_num=attr)
     db.session.add(prod)
+    bump("products")
     db.session.commit()
+    catalog.invalidate()
 
     return (
         jsonify({"id": prod.id, "name": prod.name,
-                 "price": prod.price, "attr_num": prod.attr_num}),
+                 "price": dollars(prod.price), "attr_num": prod.attr_num}),
         201,
     )
 
 
 @products_bp.get("")
+@conditional("products")
 def list_products():
-    products = Product.query.all()
-    return jsonify(
+    try:
+        limit, cursor, fields = parse_page_args(request.args)
+        products, next_cursor = keyset_page(Product.query, (Product.id,), cursor, limit)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    return page_response(
         [
-            {"id": p.id, "name": p.name,
-             "price": p.price, "attr_num": p.attr_num}
+            project({"id": p.id, "name": p.name,
+                     "price": dollars(p.price), "attr_num": p.attr_num}, fields)
             for p in products
-        ]
+        ],
+        next_cursor,
     )
+
+
+@products_bp.get("/search")
+@conditional("products")
+def search_products():
+    q = request.args.get("q", "")
+    if search.match_expr(q) is None:
+        return jsonify({"error": "q must contain at least one letter or digit"}), 400
+    try:
+        limit = int(request.args.get("limit", search.DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= limit <= search.MAX_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {search.MAX_LIMIT}"}), 400
+
+    return jsonify([
+        {"id": p.id, "name": p.name, "price": dollars(p.price), "attr_num": p.attr_num}
+        for p in search.products(q, limit)
+    ])
@@ -0,0 +1,125 @@
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy import func, select
+
+from ..exporter import date_range_args
+from ..extensions import db
+from ..models import DailySales, Product
+from ..money import dollars
+from ..versions import conditional
+
+reports_bp = Blueprint("reports", __name__, url_prefix="/api/reports")
+
+DATE_FMT = "%Y-%m-%d"
+
+# SQL expression for the bucket each summary date falls into
+PERIODS = {
+    "day":   lambda col: func.date(col),
+    "week":  lambda col: func.date(col, "weekday 0", "-6 days"),   # Monday
+    "month": lambda col: func.strftime("%Y-%m", col),
+}
+GROUP_BY = (*PERIODS, "product")
+
+
+# ---------- helpers ----------
+def _sales_rollup(start_d, end_d, group_by):
+    """Roll daily_sales rows up to the requested grouping (O(days × products))."""
+    if group_by == "product":
+        keys = (DailySales.product_id.label("product_id"), Product.name.label("product_name"))
+        group_cols = (DailySales.product_id, Product.name)
+    else:
+        period = PERIODS[group_by](DailySales.date).label("period")
+        keys = (period,)
+        group_cols = (period,)
+
+    stmt = (
+        select(
+            *keys,
+            func.sum(DailySales.entries).label("entries"),
+            func.sum(DailySales.units).label("units"),
+            func.sum(DailySales.gross).label("gross"),
+            func.sum(DailySales.discounts).label("discounts"),
+            func.sum(DailySales.gross - DailySales.discounts).label("revenue"),
+            func.sum(DailySales.card).label("card"),
+            func.sum(DailySales.cash).label("cash"),
+        )
+        .select_from(DailySales)
+        .outerjoin(Product, Product.id == DailySales.product_id)
+        .where(DailySales.date >= start_d, DailySales.date <= end_d)
+        .group_by(*group_cols)
+        .order_by(*group_cols)
+    )
+    return db.session.execute(stmt).mappings().all()
+
+
+# ---------- endpoints ----------
+@reports_bp.get("/sales")
+@conditional("sales")
+def sales_report():
+    """
+    Sales totals for [start, end] grouped by day | week | month | product:
+
+       GET /api/reports/sales?start=2024-01-01&end=2024-12-31&group_by=month
+
+    Revenue is qty × price − discount; card/cash come from the entry payments.
+    Reads the precomputed daily_sales table, never the raw entries; sums are
+    exact integer cents until they are turned into dollars for the response.
+    """
+    start = request.args.get("start")
+    end = request.args.get("end")
+    group_by = request.args.get("group_by", "day")
+    if not (start and end):
+        return jsonify({"error": "start and end query params required"}), 400
+    if group_by not in GROUP_BY:
+        return jsonify({"error": f"group_by must be one of {', '.join(GROUP_BY)}"}), 400
+    try:
+        start_d = datetime.strptime(start, DATE_FMT).date()
+        end_d = datetime.strptime(end, DATE_FMT).date()
+    except ValueError:
+        return jsonify({"error": "Invalid date format, use YYYY-MM-DD"}), 400
+
+    money = ("gross", "discounts", "revenue", "card", "cash")
+    rows = []
+    totals = dict.fromkeys(("entries", "units", *money), 0)
+    for r in _sales_rollup(start_d, end_d, group_by):
+        row = dict(r)
+        for k in totals:
+            row[k] = row[k] or 0
+            totals[k] += row[k]
+        for k in money:
+            row[k] = dollars(row[k])
+        rows.append(row)
+    for k in money:
+        totals[k] = dollars(totals[k])
+
+    return jsonify(
+        {
+            "start": start,
+            "end": end,
+            "group_by": group_by,
+            "rows": rows,
+            "totals": totals,
+        }
+    )
+
+
+@reports_bp.get("/reconciliation")
+@conditional("inventory", "sales", "products")
+def reconciliation_report():
+    """
+    Inventory snapshots in [start, end] reconciled against what was sold
+    between them — per product movement, sold, received, shrinkage,
+    sell-through and days of cover:
+
+       GET /api/reports/reconciliation?start=2024-01-01&end=2024-03-31
+    """
+    from ..reconciliation import reconcile        # pandas only loads when used
+
+    try:
+        start_d, end_d = date_range_args(request.args)
+        report = reconcile(start_d, end_d, current_app.config["ANALYTICS_CHUNK"])
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    return jsonify({"start": start_d.isoformat(), "end": end_d.isoformat(), **report})
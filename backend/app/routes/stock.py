@@ -0,0 +1,44 @@
+from flask import Blueprint, jsonify
+from sqlalchemy import select
+
+from .. import catalog, serializers
+from ..extensions import db
+from ..models import StockLevel
+from ..stock import latest_snapshot
+from ..versions import conditional
+
+stock_bp = Blueprint("stock", __name__, url_prefix="/api/stock")
+
+STOCK_COLUMNS = (StockLevel.product_id, StockLevel.counted, StockLevel.sold)
+
+
+@stock_bp.get("")
+@conditional("inventory", "sales")
+def current_stock():
+    """
+    On-hand quantity of every product: the latest inventory count (``as_of``)
+    minus the units sold after it.  Products the count didn't list and that
+    haven't sold since are left out (zero on hand).
+    """
+    rows = db.session.connection().execute(
+        select(*STOCK_COLUMNS).order_by(StockLevel.product_id)
+    ).all()
+    as_of = latest_snapshot()
+    products = catalog.products()
+    return jsonify({
+        "as_of": as_of.isoformat() if as_of else None,
+        "rows": [serializers.stock_level(r, products) for r in rows],
+    })
+
+
+@stock_bp.get("/<int:product_id>")
+@conditional("inventory", "sales")
+def product_stock(product_id):
+    if product_id not in catalog.products():
+        return jsonify({"error": "Product not found"}), 404
+    row = db.session.connection().execute(
+        select(*STOCK_COLUMNS).where(StockLevel.product_id == product_id)
+    ).first()
+    out = serializers.stock_level(row or (product_id, 0, 0), catalog.products())
+    as_of = latest_snapshot()
+    return jsonify({"as_of": as_of.isoformat() if as_of else None, **out})
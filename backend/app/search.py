@@ -0,0 +1,56 @@
+"""
+Product search over the ``product_search`` FTS5 index.
+
+Every word of the query must prefix-match a word of the product's name or
+``attr_num`` (case- and accent-insensitive); results are ranked by bm25,
+name hits above attr_num hits:
+
+   search.products("choc bar", limit=20)   # "Chocolate Bar 100g", "Dark choc bar"…
+
+The index is declared with the product model (models/product.py) and
+triggers keep it in step with every product write, so nothing here needs
+to run on writes.  ``rebuild()`` re-indexes from scratch
+(``flask rebuild-search``).
+"""
+import re
+
+from sqlalchemy import text
+
+from .extensions import db
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT     = 100
+MAX_TERMS     = 8
+WEIGHTS       = (10.0, 1.0)             # bm25 weight of name, attr_num
+
+# unicode61 splits on everything but letters and digits, so do the same:
+# each term is then a plain word and FTS query syntax in *q* is inert
+_TERM = re.compile(r"[^\W_]+")
+
+_SEARCH = text(f"""
+    SELECT p.id, p.name, p.price, p.attr_num
+    FROM product_search
+    JOIN product p ON p.id = product_search.rowid
+    WHERE product_search MATCH :match
+    ORDER BY bm25(product_search, {WEIGHTS[0]}, {WEIGHTS[1]}), p.id
+    LIMIT :limit
+""")
+
+
+def match_expr(q):
+    """FTS5 query for *q*: every word as a prefix, all required; None if no words."""
+    terms = _TERM.findall(q or "")[:MAX_TERMS]
+    return " ".join(f'"{t}"*' for t in terms) or None
+
+
+def products(q, limit=DEFAULT_LIMIT):
+    """Best *limit* (id, name, price, attr_num) rows matching *q*."""
+    match = match_expr(q)
+    if match is None:
+        return []
+    return db.session.connection().execute(_SEARCH, {"match": match, "limit": limit}).all()
+
+
+def rebuild():
+    """Re-index every product (after a bulk load with the triggers missing)."""
+    db.session.execute(text("INSERT INTO product_search (product_search) VALUES ('rebuild')"))
@@ -0,0 +1,113 @@
+"""
+Row → JSON-ready dict serializers shared by the blueprints.
+
+Inputs are the plain rows selected in queries.py (tuples unpacked by
+position), product details come from the catalog, and ``fields`` is the
+``?fields=`` projection (None = everything):
+
+   rows = db.session.connection().execute(entry_rows()).all()
+   jsonify(serializers.entries(rows, catalog.products(), payments_by_entry(ids)))
+"""
+from .money import dollars
+from .pagination import project
+
+DATE_FMT = "%Y-%m-%d"
+
+
+# ---------- sales ----------
+def payments(rows):
+    return [{"id": pid, "payment_type": ptype, "amount": dollars(amount)}
+            for pid, ptype, amount in rows]
+
+
+def entry(row, products, payments_=None, fields=None):
+    """One ENTRY_COLUMNS row; *payments_* are its PAYMENT_COLUMNS rows (omitted if None)."""
+    eid, batch_id, product_id, qty, price, discount, size = row
+    out = {"id": eid, "batch_id": batch_id, "product_id": product_id}
+    if fields is None or "product_name" in fields:
+        prod = products.get(product_id)
+        out["product_name"] = prod.name if prod else None
+    out.update(qty=qty, price=dollars(price), discount=dollars(discount), size=size)
+    if payments_ is not None:
+        out["payments"] = payments(payments_)
+    return project(out, fields)
+
+
+def entries(rows, products, payments_by_entry=None, fields=None):
+    if payments_by_entry is None:
+        return [entry(r, products, None, fields) for r in rows]
+    return [entry(r, products, payments_by_entry.get(r[0], ()), fields) for r in rows]
+
+
+def batch(row, entries_=None):
+    """One BATCH_COLUMNS row, with already-serialized *entries_* if given."""
+    bid, bdate, card, cash, total = row
+    out = {"id": bid, "date": bdate.isoformat(),
+           "card_amount": dollars(card), "cash_amount": dollars(cash),
+           "total_amount": dollars(total)}
+    if entries_ is not None:
+        out["entries"] = entries_
+    return out
+
+
+# ---------- inventory ----------
+def inventory_items(rows, products):
+    out = []
+    for item_id, product_id, qty in rows:
+        prod = products[product_id]
+        out.append({
+            "id": item_id,
+            "product_id": product_id,
+            "attrNumber": prod.attr_num or "",
+            "name": prod.name,
+            "price": dollars(prod.price),
+            "qty": qty,
+        })
+    return out
+
+
+def inventory(row, products, items=None, fields=None):
+    """One INVENTORY_COLUMNS row; *items* are its ITEM_COLUMNS rows (omitted if None)."""
+    inv_id, inv_date, qty_amount, total_amount = row
+    out = {
+        "id": inv_id,
+        "date": inv_date.strftime(DATE_FMT),
+        "qty": qty_amount,
+        "total": dollars(total_amount),
+    }
+    if items is not None:
+        out["items"] = inventory_items(items, products)
+    return project(out, fields)
+
+
+# ---------- stock ----------
+def stock_level(row, products):
+    """One (product_id, counted, sold) stock_level row."""
+    product_id, counted, sold = row
+    prod = products.get(product_id)
+    return {"product_id": product_id, "name": prod.name if prod else None,
+            "counted": counted, "sold": sold, "on_hand": counted - sold}
+
+
+# ---------- jobs ----------
+def _iso(value):
+    return value.isoformat() + "Z" if value else None
+
+
+def job(row):
+    """One jobs.JOB_COLUMNS row; ``download`` is set once a job has left a file."""
+    (job_id, kind, status, params, progress, result, error, file,
+     created_at, started_at, finished_at) = row
+    return {
+        "id": job_id,
+        "kind": kind,
+        "status": status,
+        "params": params,
+        "progress": progress,
+        "result": result,
+        "error": error,
+        "download": f"/api/jobs/{job_id}/file" if file else None,
+        "created_at": _iso(created_at),
+        "started_at": _iso(started_at),
+        "finished_at": _iso(finished_at),
+    }
@@ -0,0 +1,25 @@
+"""
+Per-connection SQLite tuning.
+
+``SQLITE_PRAGMAS`` from the active config is issued on every new DBAPI
+connection (PRAGMAs such as busy_timeout and cache_size are per
+connection, so they must be set each time the pool opens one).
+"""
+from sqlalchemy import event
+
+from .extensions import db
+
+
+def configure_sqlite(app):
+    pragmas = app.config.get("SQLITE_PRAGMAS") or {}
+    with app.app_context():
+        engine = db.engine
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cur.execute(f"PRAGMA {name}={value}")
+        cur.close()
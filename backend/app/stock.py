@@ -0,0 +1,91 @@
+"""
+Current stock per product, kept in the ``stock_level`` table.
+
+Stock is the latest inventory snapshot (counted at close of its day; a
+product it doesn't list counts as zero — the same rules as
+reconciliation.py) minus the units sold on later days:
+
+   on_hand = counted − sold
+
+Each row stores both halves, so "how many of X do we have" is one
+primary-key read.  The table is kept in step inside the writing
+transaction:
+
+   apply_sales({(date, product_id): Δunits})   # from summary.apply_delta
+   inventories_changed([date, …])              # after an inventory write
+
+``rebuild()`` recomputes it from the latest snapshot and daily_sales
+(``flask rebuild-stock``).
+"""
+from collections import defaultdict
+
+from sqlalchemy import Date, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .extensions import db
+from .models import DailySales, Inventory, InventoryEntry, StockLevel
+
+
+def latest_snapshot():
+    """Date of the newest inventory, or None (one index lookup)."""
+    return db.session.execute(select(func.max(Inventory.date))).scalar()
+
+
+def rebuild():
+    """Recompute every row from the latest snapshot and the sales after it."""
+    db.session.execute(delete(StockLevel))
+    as_of = latest_snapshot()
+    if as_of is None:
+        return
+    day = literal(as_of, Date)
+    parts = union_all(
+        select(InventoryEntry.product_id.label("product_id"),
+               InventoryEntry.qty.label("counted"), literal(0).label("sold"))
+        .join(Inventory, Inventory.id == InventoryEntry.inventory_id)
+        .where(Inventory.date == day),
+        select(DailySales.product_id, literal(0), DailySales.units)
+        .where(DailySales.date > day),
+    ).subquery()
+    db.session.execute(
+        insert(StockLevel).from_select(
+            ("product_id", "counted_on", "counted", "sold"),
+            select(parts.c.product_id, day, func.sum(parts.c.counted), func.sum(parts.c.sold))
+            .group_by(parts.c.product_id),
+        )
+    )
+
+
+def inventories_changed(dates):
+    """
+    Call after inventories on *dates* were created, edited or deleted
+    (old and new dates for a moved one).  Only a change to the latest
+    snapshot — or to which snapshot is latest — rebuilds the table.
+    """
+    as_of = latest_snapshot()
+    stored = db.session.execute(select(StockLevel.counted_on).limit(1)).scalar()
+    if as_of != stored or as_of in set(dates):
+        rebuild()
+
+
+def apply_sales(units):
+    """Fold {(date, product_id): Δunits} from a sales write into the sold counts."""
+    if not any(units.values()):
+        return
+    as_of = latest_snapshot()
+    if as_of is None:
+        return                  # nothing counted yet, so no stock to sell from
+
+    sold = defaultdict(int)
+    for (sale_date, product_id), n in units.items():
+        if sale_date > as_of:   # sales on the snapshot day are already in the count
+            sold[product_id] += n
+    rows = [{"product_id": pid, "counted_on": as_of, "counted": 0, "sold": n}
+            for pid, n in sold.items() if n]
+    if not rows:
+        return
+    stmt = sqlite_insert(StockLevel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StockLevel.product_id],
+        set_={"sold": StockLevel.sold + stmt.excluded.sold},
+    )
+    db.session.execute(stmt, rows)
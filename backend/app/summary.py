@@ -0,0 +1,128 @@
+"""
+Maintenance of the ``daily_sales`` summary table (see models/summary.py).
+
+Write endpoints capture what the touched entries contributed before and
+after the change and hand both to ``apply_delta``, which upserts only the
+difference into the affected (date, product_id) rows:
+
+   before = contributions([entry])
+   … modify entry / payments, flush …
+   apply_delta(before, contributions([entry]))
+
+``rebuild()`` recomputes the whole table from Entry/Payment (``flask
+rebuild-summary``).  Unit changes are passed on to the stock levels
+(stock.py), which count sales from this table.
+"""
+from sqlalchemy import case, delete, func, insert, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import stock
+from .extensions import db
+from .models import Batch, DailySales, Entry, Payment
+
+METRICS = ("entries", "units", "gross", "discounts", "card", "cash")
+
+
+def _accumulate(out, key, qty, price, discount, payments):
+    card = cash = 0
+    for kind, amount in payments:
+        kind = kind.lower()
+        if kind == "card":
+            card += amount
+        elif kind == "cash":
+            cash += amount
+    row = out.setdefault(key, [0] * len(METRICS))
+    for i, v in enumerate((1, qty, qty * price, discount or 0, card, cash)):
+        row[i] += v
+
+
+def contributions(entries) -> dict:
+    """{(date, product_id): [entries, units, gross, discounts, card, cash]}"""
+    out = {}
+    for e in entries:
+        _accumulate(out, (e.batch.date, e.product_id), e.qty, e.price, e.discount,
+                    ((p.payment_type, p.amount) for p in e.payments))
+    return out
+
+
+def row_contributions(batch_date, rows) -> dict:
+    """Same as contributions() for plain entry dicts (with nested "payments")."""
+    out = {}
+    for r in rows:
+        _accumulate(out, (batch_date, r["product_id"]), r["qty"], r["price"],
+                    r.get("discount"),
+                    ((p["payment_type"], p["amount"]) for p in r.get("payments", ())))
+    return out
+
+
+def apply_delta(before: dict, after: dict):
+    """
+    Add (after − before) to daily_sales with one executemany upsert; rows
+    that drop to zero entries go away.
+    """
+    zero = [0] * len(METRICS)
+    rows = []
+    units = {}
+    for key in before.keys() | after.keys():
+        old, new = before.get(key, zero), after.get(key, zero)
+        delta = [n - o for n, o in zip(new, old)]
+        if not any(delta):
+            continue
+        rows.append({"date": key[0], "product_id": key[1], **dict(zip(METRICS, delta))})
+        units[key] = delta[1]
+    if not rows:
+        return
+
+    stmt = sqlite_insert(DailySales)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailySales.date, DailySales.product_id],
+        set_={m: getattr(DailySales, m) + stmt.excluded[m] for m in METRICS},
+    )
+    db.session.execute(stmt, rows)
+    db.session.execute(
+        delete(DailySales).where(
+            tuple_(DailySales.date, DailySales.product_id).in_(list(units)),
+            DailySales.entries <= 0,
+        )
+    )
+    stock.apply_sales(units)
+
+
+def payment_totals():
+    """Per-entry card/cash sums, pre-aggregated so joining them stays 1:1."""
+    ptype = func.lower(Payment.payment_type)
+    return (
+        select(
+            Payment.entry_id.label("entry_id"),
+            func.sum(case((ptype == "card", Payment.amount), else_=0)).label("card"),
+            func.sum(case((ptype == "cash", Payment.amount), else_=0)).label("cash"),
+        )
+        .group_by(Payment.entry_id)
+        .subquery()
+    )
+
+
+def rebuild():
+    """Recompute daily_sales from scratch with one INSERT … SELECT (and the stock levels)."""
+    pay = payment_totals()
+    source = (
+        select(
+            Batch.date,
+            Entry.product_id,
+            func.count(Entry.id),
+            func.sum(Entry.qty),
+            func.sum(Entry.qty * Entry.price),
+            func.sum(func.coalesce(Entry.discount, 0)),
+            func.sum(func.coalesce(pay.c.card, 0)),
+            func.sum(func.coalesce(pay.c.cash, 0)),
+        )
+        .select_from(Entry)
+        .join(Batch, Batch.id == Entry.batch_id)
+        .outerjoin(pay, pay.c.entry_id == Entry.id)
+        .group_by(Batch.date, Entry.product_id)
+    )
+    db.session.execute(delete(DailySales))
+    db.session.execute(
+        insert(DailySales).from_select(("date", "product_id", *METRICS), source)
+    )
+    stock.rebuild()
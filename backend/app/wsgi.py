@@ -1,6 +1,6 @@
-from app import create_app
+from . import create_app
 
-app = create_app()
+app = create_app(cli=False)          # gunicorn: no `flask db` machinery (see gunicorn.conf.py)
 
 if __name__ == "__main__":
     # `flask run` will also pick this up
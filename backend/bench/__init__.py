@@ -0,0 +1,6 @@
+"""
+Benchmarks (not part of the app).  Run from backend/:
+
+   python -m bench.indexes --entries 1000000
+   python -m bench.endpoints --baseline bench/baseline.json
+"""
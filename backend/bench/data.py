@@ -0,0 +1,118 @@
+"""
+Synthetic data for the benchmarks.
+
+``seed(path, Volumes(...))`` creates the schema in a fresh SQLite file and
+fills it with raw ``sqlite3`` executemany calls (fast even for millions of
+rows), deterministic for a given ``seed``.  Batch totals, the daily_sales
+summary and the resource version stamps are filled in as well, so every
+endpoint sees a consistent database.
+"""
+import random
+import sqlite3
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+
+from app.extensions import db
+import app.models  # noqa: F401  (registers every table on db.metadata)
+
+START = date(2020, 1, 1)
+SIZES = ("S", "M", "L", "XL", None)
+
+
+@dataclass
+class Volumes:
+    products: int = 500
+    days: int = 365                    # one batch per day
+    entries_per_day: int = 100
+    payments_per_entry: int = 1
+    inventories: int = 52              # one per week, from START
+    items_per_inventory: int = 300
+    seed: int = 42
+
+    @property
+    def entries(self):
+        return self.days * self.entries_per_day
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def day(n) -> date:
+    return START + timedelta(days=n)
+
+
+def seed(path, vol: Volumes):
+    """Create and fill the SQLite database at *path*."""
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+    rnd = random.Random(vol.seed)
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA synchronous=OFF")
+    con.execute("PRAGMA journal_mode=MEMORY")
+
+    prices = {i: round(rnd.uniform(1, 50) * 100) for i in range(1, vol.products + 1)}   # cents
+    con.executemany(
+        "INSERT INTO product (id, name, price, attr_num) VALUES (?, ?, ?, ?)",
+        ((i, f"Product {i}", p, f"A{i:05d}") for i, p in prices.items()),
+    )
+
+    batches, entries, payments = [], [], []
+    entry_id = 0
+    for d in range(vol.days):
+        card = cash = 0
+        for _ in range(vol.entries_per_day):
+            entry_id += 1
+            pid = rnd.randint(1, vol.products)
+            qty = rnd.randint(1, 5)
+            total = qty * prices[pid]
+            entries.append((entry_id, d + 1, pid, qty, prices[pid], 0, rnd.choice(SIZES)))
+            share = total // vol.payments_per_entry
+            for _ in range(vol.payments_per_entry):
+                kind = rnd.choice(("card", "cash"))
+                payments.append((entry_id, kind, share))
+                if kind == "card":
+                    card += share
+                else:
+                    cash += share
+        batches.append((d + 1, day(d).isoformat(), card, cash, card + cash))
+
+    con.executemany(
+        "INSERT INTO batch (id, date, card_amount, cash_amount, total_amount) "
+        "VALUES (?, ?, ?, ?, ?)", batches)
+    con.executemany(
+        "INSERT INTO entry (id, batch_id, product_id, qty, price, discount, size) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)", entries)
+    con.executemany(
+        "INSERT INTO payment (entry_id, payment_type, amount) VALUES (?, ?, ?)", payments)
+
+    n_items = min(vol.items_per_inventory, vol.products)
+    inventories, items = [], []
+    for w in range(vol.inventories):
+        stock = [(pid, rnd.randint(0, 40)) for pid in rnd.sample(range(1, vol.products + 1), n_items)]
+        inventories.append((w + 1, day(7 * w).isoformat(), sum(q for _, q in stock),
+                            sum(q * prices[p] for p, q in stock)))
+        items.extend((w + 1, pid, qty) for pid, qty in stock)
+    con.executemany(
+        "INSERT INTO inventory (id, date, qty_amount, total_amount) VALUES (?, ?, ?, ?)",
+        inventories)
+    con.executemany(
+        "INSERT INTO inventory_entry (inventory_id, product_id, qty) VALUES (?, ?, ?)", items)
+
+    con.executemany(
+        "INSERT INTO resource_version (name, version) VALUES (?, 1)",
+        ((n,) for n in ("products", "inventory", "sales")),
+    )
+    con.commit()
+    con.close()
+
+
+def finish(app):
+    """Steps that go through the app: the daily_sales summary."""
+    from app.summary import rebuild
+    with app.app_context():
+        rebuild()
+        db.session.commit()
@@ -0,0 +1,311 @@
+"""
+Latency, SQL statements and peak memory for every API route.
+
+Seeds a throw-away SQLite file (see bench/data.py), then drives each route
+of the products, batches, entries and inventory blueprints through the
+Flask test client ``--repeat`` times.  Writes get fresh targets prepared
+outside the timed section.  Reports p50/p99 latency, statements per request
+and the peak traced memory of one extra request:
+
+   python -m bench.endpoints                              # print the table
+   python -m bench.endpoints --save bench/baseline.json   # record a baseline
+   python -m bench.endpoints --baseline bench/baseline.json
+
+With ``--baseline`` the run is compared against the recorded numbers and
+exits 1 when a route got slower (p50 beyond ``--tolerance``), issues more
+statements, or peaks higher in memory.  Baselines only compare between
+runs on the same machine with the same volumes; record one on the Pi.
+"""
+import argparse
+import io
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import fields
+from itertools import count
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from sqlalchemy import event
+
+from app import create_app
+from app.config import ProdConfig
+from app.extensions import db
+from bench import data
+
+
+class Case(NamedTuple):
+    name: str           # blueprint.view
+    method: str
+    prepare: Callable   # (ctx) -> (url, request kwargs); not timed
+
+
+class Ctx:
+    """Client plus what the cases need to pick or create their targets."""
+
+    def __init__(self, client, vol):
+        self.client = client
+        self.vol = vol
+        self.rnd = random.Random(vol.seed)             # re-seeded per case
+        self._fresh_day = count(vol.days + 7 * vol.inventories)   # past all seeded dates
+
+    def fresh_date(self):
+        return data.day(next(self._fresh_day)).isoformat()
+
+    def seeded_date(self):
+        return data.day(self.rnd.randrange(self.vol.days)).isoformat()
+
+    def window(self, days):
+        """(start, end) ISO dates of a *days* long range inside the seeded data."""
+        first = self.rnd.randrange(max(1, self.vol.days - days))
+        return data.day(first).isoformat(), data.day(first + days - 1).isoformat()
+
+    def product(self):
+        return self.rnd.randint(1, self.vol.products)
+
+    def entry_payload(self):
+        qty = self.rnd.randint(1, 5)
+        return {"product_id": self.product(), "qty": qty, "price": 9.5, "size": "M",
+                "payments": [{"payment_type": "card", "amount": qty * 9.5}]}
+
+    def items(self, n):
+        n = min(n, self.vol.products)
+        return [{"product_id": p, "qty": self.rnd.randint(0, 40)}
+                for p in self.rnd.sample(range(1, self.vol.products + 1), n)]
+
+    # untimed setup calls
+    def _ok(self, resp):
+        if resp.status_code >= 400:
+            raise RuntimeError(f"setup failed: {resp.status_code} {resp.get_data(as_text=True)}")
+        return resp.get_json()
+
+    def new_batch(self, entries=0):
+        batch_id = self._ok(self.client.post("/api/batches", json={"date": self.fresh_date()}))["id"]
+        if entries:
+            self._ok(self.client.post("/api/entries/bulk", json={
+                "batch_id": batch_id,
+                "entries": [self.entry_payload() for _ in range(entries)],
+            }))
+        return batch_id
+
+    def new_entry(self):
+        return self._ok(self.client.post(
+            "/api/entries", json={"batch_id": self.rnd.randint(1, self.vol.days),
+                                  **self.entry_payload()}))["id"]
+
+    def new_inventory(self, items=50):
+        return self._ok(self.client.post(
+            "/api/inventory", json={"date": self.fresh_date(), "items": self.items(items)}))
+
+
+def _import_csv(ctx, rows=500):
+    day = ctx.fresh_date()
+    body = "date,product_id,qty\n" + "".join(
+        f"{day},{it['product_id']},{it['qty']}\n" for it in ctx.items(rows))
+    return {"data": {"file": (io.BytesIO(body.encode()), "inventory.csv")},
+            "content_type": "multipart/form-data"}
+
+
+CASES = (
+    # ---- reads ----
+    Case("products.list_products", "GET", lambda c: ("/api/products?limit=100", {})),
+    Case("products.search_products", "GET",
+         lambda c: (f"/api/products/search?q=product {c.product() % 100}", {})),
+    Case("batches.list_batches", "GET", lambda c: ("/api/batches?limit=100", {})),
+    Case("batches.get_batch_by_date", "GET",
+         lambda c: (f"/api/batches/by-date/{c.seeded_date()}", {})),
+    Case("batches.get_batches_in_range", "GET",
+         lambda c: ("/api/batches/range?start={}&end={}".format(*c.window(7)), {})),
+    Case("batches.export_batches", "GET",
+         lambda c: ("/api/batches/export?start={}&end={}".format(*c.window(365)), {})),
+    Case("entries.list_entries", "GET",
+         lambda c: (f"/api/entries?batch_id={c.rnd.randint(1, c.vol.days)}", {})),
+    Case("entries.export_entries", "GET",
+         lambda c: ("/api/entries/export?start={}&end={}".format(*c.window(30)), {})),
+    Case("entries.export_payments", "GET",
+         lambda c: ("/api/entries/payments/export?start={}&end={}".format(*c.window(30)), {})),
+    Case("inventory.list_inventory", "GET",
+         lambda c: ("/api/inventory?start={}&end={}".format(*c.window(90)), {})),
+    Case("inventory.get_inventory", "GET",
+         lambda c: (f"/api/inventory/{c.rnd.randint(1, c.vol.inventories)}", {})),
+    Case("inventory.export_inventory", "GET",
+         lambda c: ("/api/inventory/export?start={}&end={}".format(*c.window(90)), {})),
+    Case("inventory.inventory_import_template", "GET",
+         lambda c: ("/api/inventory/import-template", {})),
+    Case("stock.current_stock", "GET", lambda c: ("/api/stock", {})),
+    Case("stock.product_stock", "GET",
+         lambda c: (f"/api/stock/{c.product()}", {})),
+    # ---- writes ----
+    Case("products.create_product", "POST",
+         lambda c: ("/api/products", {"json": {"name": "Bench", "price": 4.5}})),
+    Case("batches.create_batch", "POST",
+         lambda c: ("/api/batches", {"json": {"date": c.fresh_date()}})),
+    Case("batches.update_batch", "PATCH",
+         lambda c: (f"/api/batches/{c.rnd.randint(1, c.vol.days)}", {"json": {"card_amount": 1.0}})),
+    Case("batches.delete_batch", "DELETE",
+         lambda c: (f"/api/batches/{c.new_batch(entries=20)}", {})),
+    Case("entries.create_entry", "POST",
+         lambda c: ("/api/entries", {"json": {"batch_id": c.rnd.randint(1, c.vol.days),
+                                              **c.entry_payload()}})),
+    Case("entries.create_entries_bulk", "POST",
+         lambda c: ("/api/entries/bulk", {"json": {
+             "batch_id": c.new_batch(),
+             "entries": [c.entry_payload() for _ in range(200)]}})),
+    Case("entries.update_entry", "PATCH",
+         lambda c: (f"/api/entries/{c.rnd.randint(1, c.vol.entries)}",
+                    {"json": {"qty": 3, "payments": [{"payment_type": "cash", "amount": 3}]}})),
+    Case("entries.delete_entry", "DELETE",
+         lambda c: (f"/api/entries/{c.new_entry()}", {})),
+    Case("inventory.create_inventory", "POST",
+         lambda c: ("/api/inventory", {"json": {"date": c.fresh_date(), "items": c.items(300)}})),
+    Case("inventory.update_inventory", "PUT",
+         lambda c: (f"/api/inventory/{c.new_inventory()['id']}",
+                    {"json": {"date": c.fresh_date(), "items": c.items(300)}})),
+    Case("inventory.delete_inventory", "DELETE",
+         lambda c: (f"/api/inventory/{c.new_inventory()['id']}", {})),
+    Case("inventory.delete_inventory_item", "DELETE",
+         lambda c: (f"/api/inventory/items/{c.new_inventory(5)['items'][0]['id']}", {})),
+    Case("inventory.import_inventory", "POST",
+         lambda c: ("/api/inventory/import", _import_csv(c))),
+)
+
+
+# ---------- measuring ----------
+class _StatementCounter:
+    def __init__(self, engine):
+        self.n = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *_):
+        self.n += 1
+
+
+def _request(ctx, case):
+    url, kwargs = case.prepare(ctx)
+    resp = ctx.client.open(url, method=case.method, **kwargs)
+    resp.get_data()                        # drain streamed bodies inside the timing
+    if resp.status_code >= 400:
+        raise RuntimeError(f"{case.name}: {resp.status_code} {resp.get_data(as_text=True)[:200]}")
+    resp.close()
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def measure(ctx, case, counter, repeat, warmup=2):
+    ctx.rnd = random.Random(f"{ctx.vol.seed}:{case.name}")    # same targets with --only
+    for _ in range(warmup):
+        _request(ctx, case)
+
+    times, statements = [], []
+    for _ in range(repeat):
+        url, kwargs = case.prepare(ctx)
+        counter.n = 0
+        t0 = time.perf_counter()
+        resp = ctx.client.open(url, method=case.method, **kwargs)
+        resp.get_data()
+        times.append((time.perf_counter() - t0) * 1000)
+        statements.append(counter.n)
+        resp.close()
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    _request(ctx, case)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(times), 3),
+        "p99_ms": round(_percentile(times, 99), 3),
+        "queries": max(statements),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+# ---------- baseline ----------
+def regressions(result, base, tolerance):
+    """Human-readable list of what got worse than *base*."""
+    out = []
+    if result["p50_ms"] > base["p50_ms"] * (1 + tolerance) and result["p50_ms"] - base["p50_ms"] > 0.5:
+        out.append(f"p50 {base['p50_ms']:.2f} → {result['p50_ms']:.2f} ms")
+    if result["queries"] > base["queries"]:
+        out.append(f"queries {base['queries']} → {result['queries']}")
+    if result["peak_kib"] > base["peak_kib"] * (1 + tolerance) and result["peak_kib"] - base["peak_kib"] > 64:
+        out.append(f"peak {base['peak_kib']:.0f} → {result['peak_kib']:.0f} KiB")
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    defaults = data.Volumes()
+    for f in fields(data.Volumes):
+        ap.add_argument(f"--{f.name.replace('_', '-')}", type=int, default=getattr(defaults, f.name))
+    ap.add_argument("--repeat", type=int, default=30)
+    ap.add_argument("--only", help="run cases whose name contains this text")
+    ap.add_argument("--baseline", type=Path, help="compare against this JSON baseline")
+    ap.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed relative p50 / memory growth (default 0.25)")
+    args = ap.parse_args(argv)
+    vol = data.Volumes(**{f.name: getattr(args, f.name) for f in fields(data.Volumes)})
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["volumes"] != vol.as_dict():
+            sys.exit(f"baseline was recorded with {baseline['volumes']}, not {vol.as_dict()}")
+
+    cases = [c for c in CASES if not args.only or args.only in c.name]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        t0 = time.perf_counter()
+        data.seed(path, vol)
+
+        class BenchConfig(ProdConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+            SQLALCHEMY_BINDS = {"jobs": f"sqlite:///{Path(tmp) / 'jobs.db'}"}
+            JOBS_DIR = Path(tmp) / "jobs"
+            JOBS_THREADS = 0                # queued jobs stay queued; nothing runs behind the timings
+            METRICS_ENABLED = False
+
+        app = create_app(BenchConfig)
+        data.finish(app)
+        print(f"seeded {vol.entries:,} entries over {vol.days:,} days, "
+              f"{vol.inventories} inventories in {time.perf_counter() - t0:.1f}s\n")
+
+        with app.app_context():
+            counter = _StatementCounter(db.engine)
+        ctx = Ctx(app.test_client(), vol)
+        for case in cases:
+            results[case.name] = measure(ctx, case, counter, args.repeat)
+        with app.app_context():
+            db.engine.dispose()
+
+    failed = False
+    print(f"{'route':<38}{'p50 ms':>9}{'p99 ms':>9}{'queries':>9}{'peak KiB':>10}")
+    for name, r in results.items():
+        line = f"{name:<38}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['queries']:>9}{r['peak_kib']:>10.0f}"
+        if baseline and name in baseline["results"]:
+            worse = regressions(r, baseline["results"][name], args.tolerance)
+            if worse:
+                failed = True
+                line += "   REGRESSION: " + "; ".join(worse)
+        print(line)
+
+    if args.save:
+        args.save.write_text(json.dumps(
+            {"volumes": vol.as_dict(), "repeat": args.repeat, "results": results}, indent=2) + "\n")
+        print(f"\nbaseline written to {args.save}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
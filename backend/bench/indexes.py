@@ -0,0 +1,122 @@
+"""
+Range / lookup query latency with and without the hot-path indexes.
+
+Seeds a throw-away SQLite file with ``--entries`` sales entries (plus
+matching batches, payments and inventories; see bench/data.py), then times the SQL the read
+endpoints issue — first with the model indexes dropped, then with them
+created — and prints a before/after table.
+
+   python -m bench.indexes --entries 1000000 --repeat 20
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from app.extensions import db
+from bench import data
+
+# the SQL the endpoints issue (app/queries.py): column SELECTs, then one
+# IN-select of the children per IN_CHUNK parents (a day's entries fit in
+# one).  {ids} is the first column of the step before.
+PAYMENTS = ("SELECT entry_id, id, payment_type, amount FROM payment"
+            " WHERE entry_id IN ({ids}) ORDER BY entry_id, id")
+QUERIES = {
+    # list_inventory?start=&end= (one month) → inventories + items_by_inventory
+    "inventory month range": (
+        "SELECT id, date, qty_amount, total_amount FROM inventory"
+        " WHERE date >= :a AND date <= :b ORDER BY date, id",
+        "SELECT inventory_id, id, product_id, qty FROM inventory_entry"
+        " WHERE inventory_id IN ({ids}) ORDER BY inventory_id, id",
+    ),
+    # get_batch_by_date → batch + its entries + payments_by_entry
+    "batch by date": (
+        "SELECT id, date, card_amount, cash_amount, total_amount FROM batch WHERE date = :a",
+        "SELECT id, batch_id, product_id, qty, price, discount, size FROM entry"
+        " WHERE batch_id = {ids} ORDER BY id",
+        PAYMENTS,
+    ),
+    # list_entries?batch_id= → entries + payments_by_entry
+    "entries by batch": (
+        "SELECT id, batch_id, product_id, qty, price, discount, size FROM entry"
+        " WHERE batch_id = :batch ORDER BY id",
+        PAYMENTS,
+    ),
+}
+
+
+def seed(path, n_entries, n_products=500, per_day=300, inv_items=200):
+    """bench.data.seed with *n_entries* entries, *per_day* a day, weekly inventories."""
+    n_days = max(1, n_entries // per_day)
+    data.seed(path, data.Volumes(products=n_products, days=n_days, entries_per_day=per_day,
+                                 inventories=n_days // 7 + 1, items_per_inventory=inv_items))
+    return sqlite3.connect(path), n_days
+
+
+def model_indexes():
+    return [idx for t in db.metadata.sorted_tables for idx in t.indexes]
+
+
+def run_query(con, steps, params):
+    ids = None
+    for sql in steps:
+        if ids is not None:
+            sql = sql.format(ids=",".join(map(str, ids)) or "NULL")
+        rows = con.execute(sql, params).fetchall()
+        ids = [r[0] for r in rows]
+
+
+def time_queries(con, n_days, repeat):
+    rnd = random.Random(7)
+    out = {}
+    for name, steps in QUERIES.items():
+        samples = []
+        for _ in range(repeat):
+            day = data.day(rnd.randrange(n_days))
+            params = {"a": day.isoformat(),
+                      "b": (day + timedelta(days=30)).isoformat(),
+                      "batch": rnd.randint(1, n_days)}
+            t0 = time.perf_counter()
+            run_query(con, steps, params)
+            samples.append((time.perf_counter() - t0) * 1000)
+        out[name] = statistics.median(samples)
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--entries", type=int, default=200_000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        t0 = time.perf_counter()
+        con, n_days = seed(path, args.entries)
+        print(f"seeded {args.entries:,} entries over {n_days:,} days "
+              f"in {time.perf_counter() - t0:.1f}s")
+
+        for idx in model_indexes():
+            con.execute(f"DROP INDEX IF EXISTS {idx.name}")
+        before = time_queries(con, n_days, args.repeat)
+
+        for idx in model_indexes():
+            cols = ", ".join(c.name for c in idx.columns)
+            unique = "UNIQUE " if idx.unique else ""
+            con.execute(f"CREATE {unique}INDEX {idx.name} ON {idx.table.name} ({cols})")
+        con.execute("ANALYZE")
+        after = time_queries(con, n_days, args.repeat)
+        con.close()
+
+    print(f"\n{'query (median ms)':<24}{'no index':>12}{'indexed':>12}{'speedup':>10}")
+    for name in QUERIES:
+        b, a = before[name], after[name]
+        print(f"{name:<24}{b:>12.2f}{a:>12.2f}{b / a:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Worker boot time: how long a fresh process takes to be ready to serve.
+
+Each run starts a new interpreter that imports ``app.wsgi`` (create_app
+with the current ``APP_SETTINGS``, as a gunicorn worker would without
+preloading) and then forks a child that only does gunicorn's post_fork
+step (the preloaded case).  The job queue points at a temporary
+directory, so no run touches ``instance/jobs.db``.  Reports, over ``--repeat`` runs:
+
+   interpreter   python start-up until the app import begins
+   app import    import + create_app
+   cold boot     the two above: a worker without preloading
+   forked boot   fork → child ready (preload_app=True)
+
+and the packages that take longest to import (``-X importtime``):
+
+   python -m bench.startup                              # print the table
+   python -m bench.startup --save bench/startup.json    # record a baseline
+   python -m bench.startup --baseline bench/startup.json
+
+As with bench.endpoints, ``--baseline`` exits 1 when a stage got slower
+(median beyond ``--tolerance``); compare runs on the same machine only.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+STAGES = ("interpreter", "app import", "cold boot", "forked boot")
+
+# runs in the child interpreter (argv[1]: a scratch directory); prints the
+# stage times as JSON
+PROBE = """
+import json, os, sys, time
+t0 = time.perf_counter()
+from app.config import Config
+Config.SQLALCHEMY_BINDS = {"jobs": f"sqlite:///{sys.argv[1]}/jobs.db"}
+Config.JOBS_DIR = f"{sys.argv[1]}/jobs"
+from app.wsgi import app
+t1 = time.perf_counter()
+pid = os.fork()
+if pid == 0:
+    from app.extensions import dispose_engines
+    dispose_engines(app)
+    os._exit(0)
+os.waitpid(pid, 0)
+print(json.dumps({"t0": t0, "app import": t1 - t0, "forked boot": time.perf_counter() - t1}))
+"""
+
+
+def run_once(importtime=False):
+    """One fresh interpreter: ({stage: seconds}, -X importtime text or None)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", PROBE, tmp]
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=BACKEND, capture_output=True, text=True,
+                              env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+    if proc.returncode:
+        raise RuntimeError(f"app import failed:\n{proc.stderr}")
+    out = json.loads(proc.stdout.strip().splitlines()[-1])
+    # both processes share time.perf_counter's clock (CLOCK_MONOTONIC)
+    interpreter = out["t0"] - start
+    stages = {"interpreter": interpreter, "app import": out["app import"],
+              "cold boot": interpreter + out["app import"], "forked boot": out["forked boot"]}
+    return stages, (proc.stderr if importtime else None)
+
+
+def slowest_imports(report, n):
+    """[(package, ms)] of the *n* top-level packages slowest to import (cumulative)."""
+    packages = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if not cumulative.strip().isdigit() or "." in name:
+            continue
+        packages[name] = max(packages.get(name, 0), int(cumulative) / 1000)
+    return sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def regressions(now, before, tolerance):
+    return [f"{stage} {before[stage]:.0f} → {now[stage]:.0f} ms"
+            for stage in STAGES if now[stage] > before[stage] * (1 + tolerance)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--imports", type=int, default=10, help="slowest packages to list (0 = none)")
+    ap.add_argument("--baseline", type=Path, help="compare against this JSON baseline")
+    ap.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed relative growth of a stage's median (default 0.25)")
+    args = ap.parse_args(argv)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    runs = [run_once()[0] for _ in range(args.repeat)]
+    results = {stage: {"median_ms": statistics.median(r[stage] for r in runs) * 1000,
+                       "min_ms": min(r[stage] for r in runs) * 1000}
+               for stage in STAGES}
+
+    print(f"APP_SETTINGS={os.getenv('APP_SETTINGS', 'dev')}, {args.repeat} runs\n")
+    print(f"{'stage':<14}{'median ms':>11}{'min ms':>9}")
+    for stage, r in results.items():
+        print(f"{stage:<14}{r['median_ms']:>11.1f}{r['min_ms']:>9.1f}")
+
+    if args.imports:
+        print(f"\n{'package':<24}{'import ms':>10}")
+        for name, ms in slowest_imports(run_once(importtime=True)[1], args.imports):
+            print(f"{name:<24}{ms:>10.1f}")
+
+    medians = {stage: r["median_ms"] for stage, r in results.items()}
+    failed = False
+    if baseline:
+        worse = regressions(medians, baseline["median_ms"], args.tolerance)
+        failed = bool(worse)
+        print("\nREGRESSION: " + "; ".join(worse) if worse else "\nno regression vs baseline")
+    if args.save:
+        args.save.write_text(json.dumps(
+            {"repeat": args.repeat, "median_ms": medians}, indent=2) + "\n")
+        print(f"\nbaseline written to {args.save}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
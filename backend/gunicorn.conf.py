@@ -0,0 +1,24 @@
+"""
+gunicorn settings, read from the working directory — start it in backend/:
+
+   APP_SETTINGS=prod gunicorn            # flags still override, e.g. -w 2
+
+The app is built once in the master (``preload_app``) and forked into the
+workers, so a worker (re)start costs a fork instead of importing Flask,
+SQLAlchemy and every blueprint again, and the imported code is shared
+copy-on-write.  A forked worker must not use the SQLite connections the
+master opened while building the app, so each one drops them first.
+
+Code changes need a restart (``systemctl restart``), not a HUP: with
+preloading, HUP re-forks workers from the old master's code.
+"""
+wsgi_app = "app.wsgi:app"
+bind = "0.0.0.0:8000"
+workers = 4
+preload_app = True
+
+
+def post_fork(server, worker):
+    from app.extensions import dispose_engines
+    from app.wsgi import app            # already imported by the master
+    dispose_engines(app)
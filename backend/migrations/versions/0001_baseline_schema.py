@@ -0,0 +1,95 @@
+"""baseline schema
+
+Creates the original tables (0001_summary adds the later daily_sales and
+resource_version).  Tables already present (databases made with `flask
+create-db`) are left alone, so existing installs can simply run `flask db
+upgrade`.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _tables():
+    return [
+        ('product', lambda: op.create_table(
+            'product',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=80), nullable=False),
+            sa.Column('price', sa.Float(), nullable=False),
+            sa.Column('attr_num', sa.String(length=40), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )),
+        ('batch', lambda: op.create_table(
+            'batch',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('card_amount', sa.Float(), nullable=True),
+            sa.Column('cash_amount', sa.Float(), nullable=True),
+            sa.Column('total_amount', sa.Float(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )),
+        ('inventory', lambda: op.create_table(
+            'inventory',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('qty_amount', sa.Integer(), nullable=False),
+            sa.Column('total_amount', sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )),
+        ('entry', lambda: op.create_table(
+            'entry',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('batch_id', sa.Integer(), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('qty', sa.Integer(), nullable=False),
+            sa.Column('price', sa.Float(), nullable=False),
+            sa.Column('discount', sa.Float(), nullable=True),
+            sa.Column('size', sa.String(length=40), nullable=True),
+            sa.ForeignKeyConstraint(['batch_id'], ['batch.id']),
+            sa.ForeignKeyConstraint(['product_id'], ['product.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )),
+        ('payment', lambda: op.create_table(
+            'payment',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('entry_id', sa.Integer(), nullable=False),
+            sa.Column('payment_type', sa.String(length=10), nullable=False),
+            sa.Column('amount', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['entry_id'], ['entry.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )),
+        ('inventory_entry', lambda: op.create_table(
+            'inventory_entry',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('inventory_id', sa.Integer(), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('qty', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id']),
+            sa.ForeignKeyConstraint(['product_id'], ['product.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )),
+    ]
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, create in _tables():
+        if name not in existing:
+            create()
+
+
+def downgrade():
+    for name, _ in reversed(_tables()):
+        op.drop_table(name)
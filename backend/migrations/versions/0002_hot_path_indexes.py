@@ -0,0 +1,49 @@
+"""indexes on hot filter / join columns
+
+Indexes that already exist (databases made with `flask create-db`) are
+skipped.
+
+Revision ID: 0002_indexes
+Revises: 0001_summary
+Create Date: 2026-10-17 10:05:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_indexes'
+down_revision = '0001_summary'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ux_batch_date', 'batch', ['date'], True),
+    ('ix_entry_batch_product', 'entry', ['batch_id', 'product_id'], False),
+    ('ix_payment_entry', 'payment', ['entry_id'], False),
+    ('ix_inventory_date', 'inventory', ['date'], False),
+    ('ix_inventory_entry_inv_product', 'inventory_entry', ['inventory_id', 'product_id'], False),
+)
+
+
+def upgrade():
+    dupes = op.get_bind().execute(sa.text(
+        "SELECT date FROM batch GROUP BY date HAVING COUNT(*) > 1"
+    )).scalars().all()
+    if dupes:
+        raise RuntimeError(
+            "batch.date must be unique before this migration; merge or delete "
+            f"the duplicate batches on: {', '.join(map(str, dupes))}"
+        )
+
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns, unique in INDEXES:
+        if name not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
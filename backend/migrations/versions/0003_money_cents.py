@@ -0,0 +1,74 @@
+"""money columns as integer cents
+
+Converts every Float money column to INTEGER cents (19.99 → 1999).  SQLite
+can't change a column's type in place, so each table is rebuilt (batch
+mode).  Tables already in cents (databases made with `flask create-db`)
+are left alone.
+
+Revision ID: 0003_money_cents
+Revises: 0002_indexes
+Create Date: 2026-10-17 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_money_cents'
+down_revision = '0002_indexes'
+branch_labels = None
+depends_on = None
+
+
+# table → [(column, nullable)]
+MONEY = {
+    'product':     [('price', False)],
+    'batch':       [('card_amount', True), ('cash_amount', True), ('total_amount', True)],
+    'entry':       [('price', False), ('discount', True)],
+    'payment':     [('amount', False)],
+    'inventory':   [('total_amount', False)],
+    'daily_sales': [('gross', False), ('discounts', False), ('card', False), ('cash', False)],
+}
+
+
+def _pending(old_type):
+    """The MONEY tables whose columns are still *old_type*."""
+    inspector = sa.inspect(op.get_bind())
+    pending = {}
+    for table, columns in MONEY.items():
+        types = {c['name']: c['type'] for c in inspector.get_columns(table)}
+        if isinstance(types[columns[0][0]], old_type):
+            pending[table] = columns
+    return pending
+
+
+def _alter(table, columns, old, new):
+    with op.batch_alter_table(table) as batch_op:
+        for column, nullable in columns:
+            batch_op.alter_column(column, existing_type=old, type_=new,
+                                  existing_nullable=nullable)
+
+
+def upgrade():
+    pending = _pending(sa.Float)
+    if not pending:
+        return
+    for table, columns in pending.items():
+        op.execute(
+            f"UPDATE {table} SET "
+            + ", ".join(f"{c} = ROUND({c} * 100)" for c, _ in columns)
+        )
+        _alter(table, columns, sa.Float(), sa.Integer())
+
+
+def downgrade():
+    pending = _pending(sa.Integer)
+    if not pending:
+        return
+    for table, columns in pending.items():
+        _alter(table, columns, sa.Integer(), sa.Float())
+        op.execute(
+            f"UPDATE {table} SET "
+            + ", ".join(f"{c} = {c} / 100.0" for c, _ in columns)
+        )
@@ -0,0 +1,52 @@
+"""stock_level: current stock per product
+
+Filled from the latest inventory snapshot and the daily_sales after it;
+afterwards the app keeps it up to date (``flask rebuild-stock`` redoes this).
+Skipped if the table already exists (databases made with `flask create-db`).
+
+Revision ID: 0004_stock_level
+Revises: 0003_money_cents
+Create Date: 2026-10-17 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_stock_level'
+down_revision = '0003_money_cents'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'stock_level' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'stock_level',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('counted_on', sa.Date(), nullable=False),
+        sa.Column('counted', sa.Integer(), nullable=False),
+        sa.Column('sold', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['product.id']),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.execute("""
+        INSERT INTO stock_level (product_id, counted_on, counted, sold)
+        SELECT product_id, as_of, SUM(counted), SUM(sold)
+        FROM (
+            SELECT ie.product_id, i.date AS as_of, ie.qty AS counted, 0 AS sold
+            FROM inventory_entry ie JOIN inventory i ON i.id = ie.inventory_id
+            WHERE i.date = (SELECT MAX(date) FROM inventory)
+            UNION ALL
+            SELECT ds.product_id, (SELECT MAX(date) FROM inventory), 0, ds.units
+            FROM daily_sales ds
+            WHERE ds.date > (SELECT MAX(date) FROM inventory)
+        )
+        GROUP BY product_id
+    """)
+
+
+def downgrade():
+    op.drop_table('stock_level')
@@ -0,0 +1,55 @@
+"""product_search: FTS5 index over product name / attr_num
+
+An external-content FTS5 table (it stores only the index; the text stays in
+``product``) plus triggers that keep it in step with every product write.
+A later batch migration that rebuilds ``product`` drops those triggers —
+recreate them there, then ``flask rebuild-search``.  Objects that already
+exist (databases made with `flask create-db`) are kept.
+
+Revision ID: 0005_product_search
+Revises: 0004_stock_level
+Create Date: 2026-10-17 19:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_product_search'
+down_revision = '0004_stock_level'
+branch_labels = None
+depends_on = None
+
+
+DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5(
+        name, attr_num, content='product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS product_search_ai AFTER INSERT ON product BEGIN
+        INSERT INTO product_search (rowid, name, attr_num)
+        VALUES (new.id, new.name, new.attr_num);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_search_ad AFTER DELETE ON product BEGIN
+        INSERT INTO product_search (product_search, rowid, name, attr_num)
+        VALUES ('delete', old.id, old.name, old.attr_num);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_search_au
+    AFTER UPDATE OF id, name, attr_num ON product BEGIN
+        INSERT INTO product_search (product_search, rowid, name, attr_num)
+        VALUES ('delete', old.id, old.name, old.attr_num);
+        INSERT INTO product_search (rowid, name, attr_num)
+        VALUES (new.id, new.name, new.attr_num);
+    END""",
+)
+
+
+def upgrade():
+    for stmt in DDL:
+        op.execute(stmt)
+    op.execute("INSERT INTO product_search (product_search) VALUES ('rebuild')")
+
+
+def downgrade():
+    for trigger in ('product_search_ai', 'product_search_ad', 'product_search_au'):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE product_search")
@@ -0,0 +1,111 @@
+"""
+Endpoints issue a fixed number of SQL statements however many rows they
+read (queries.py: column SELECTs plus one IN-select per 500 parents) or
+write (executemany inserts and upserts).
+
+Each read endpoint is requested against a small and a large seeded
+database (bench/data.py) and the statements of the request are counted.
+Both volumes stay under IN_CHUNK parents, so the counts must be equal.
+The bulk entry endpoint is compared across payload sizes the same way.
+"""
+import pytest
+from sqlalchemy import event
+
+from app import catalog, create_app
+from app.config import Config
+from app.extensions import db
+from app.queries import IN_CHUNK
+from bench import data
+
+SMALL = data.Volumes(products=20, days=3, entries_per_day=4, payments_per_entry=1,
+                     inventories=2, items_per_inventory=5)
+LARGE = data.Volumes(products=300, days=3, entries_per_day=250, payments_per_entry=2,
+                     inventories=2, items_per_inventory=250)
+
+START, END = data.day(0).isoformat(), data.day(LARGE.days).isoformat()
+ENDPOINTS = {
+    "list_entries": "/api/entries?batch_id=1",
+    "get_batch_by_date": f"/api/batches/by-date/{START}",
+    "list_inventory": f"/api/inventory?start={START}&end={END}",
+}
+
+
+def _app(tmp_path, vol):
+    path = tmp_path / "sales.db"
+    data.seed(path, vol)
+
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLALCHEMY_BINDS = {"jobs": f"sqlite:///{tmp_path / 'jobs.db'}"}
+        JOBS_DIR = tmp_path / "jobs"
+        JOBS_THREADS = 0
+
+    app = create_app(TestConfig)
+    data.finish(app)
+    return app
+
+
+def _counted(app, request):
+    """(statements issued by *request*(), its response)."""
+    count = 0
+
+    def counter(*args):
+        nonlocal count
+        count += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        resp = request()
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+    return count, resp
+
+
+def _statements(app, url):
+    """Statements issued by one GET of *url* (after a warm-up request)."""
+    with app.app_context():
+        catalog.invalidate()        # both databases carry the same version stamps
+    client = app.test_client()
+    assert client.get(url).status_code == 200     # reloads the product catalog
+    count, resp = _counted(app, lambda: client.get(url))
+    assert resp.status_code == 200
+    return count, len(resp.data)
+
+
+@pytest.fixture(scope="module")
+def apps(tmp_path_factory):
+    assert LARGE.entries_per_day < IN_CHUNK           # one IN-select of payments per list
+    made = {size: _app(tmp_path_factory.mktemp(size), vol)
+            for size, vol in (("small", SMALL), ("large", LARGE))}
+    yield made
+    for app in made.values():
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_statements_do_not_grow_with_rows(apps, endpoint):
+    small, small_bytes = _statements(apps["small"], ENDPOINTS[endpoint])
+    large, large_bytes = _statements(apps["large"], ENDPOINTS[endpoint])
+    assert large_bytes > 10 * small_bytes       # really many more rows…
+    assert large == small                       # …for the same statements
+
+
+def test_bulk_entry_statements_do_not_grow_with_payload(tmp_path):
+    app = _app(tmp_path, SMALL)
+    client = app.test_client()
+    counts = []
+    for n, day in ((5, SMALL.days), (200, SMALL.days + 1)):
+        batch = client.post("/api/batches", json={"date": data.day(day).isoformat()})
+        entries = [{"product_id": 1 + i % SMALL.products, "qty": 2, "price": 9.5,
+                    "payments": [{"payment_type": "card", "amount": 19}]} for i in range(n)]
+        count, resp = _counted(app, lambda: client.post("/api/entries/bulk", json={
+            "batch_id": batch.get_json()["id"], "entries": entries}))
+        assert resp.status_code == 201
+        assert len(resp.get_json()["ids"]) == n
+        counts.append(count)
+    assert counts[0] == counts[1]